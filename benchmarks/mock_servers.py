@@ -0,0 +1,197 @@
+# ─── LOCAL TEAMUP / SMARTABASE STAND-INS ────────────────────────────────────
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from utils.pipeline_config import STRUCTURE_CSV
+from utils.structure_functions import load_structure
+
+CALENDAR_KEY = "benchcal"
+REPORT_PATH  = "/aspireacademy/live"
+
+
+class MockState:
+    """
+    In-memory calendar behind the mock server: the subcalendars of the
+    structure CSV, the events pushed so far, and request/429 counters.
+    latency – seconds added to every response
+    rate_limit – requests/second before answering 429 (None = unlimited)
+    error_rate – share of TeamUp calls answered with a 503 (a flaky upstream)
+    """
+
+    def __init__(self, latency=0.0, rate_limit=None, report=b"", error_rate=0.0):
+        self.latency    = latency
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.report     = report
+        self.lock       = threading.Lock()
+        self.ids        = itertools.count(1)
+
+        self.subcalendars = [
+            {"id": 1000 + i, **sc, "active": True}
+            for i, sc in enumerate(load_structure(STRUCTURE_CSV))
+        ]
+        self.events = {}
+        self.requests = {}
+        self.throttled = 0
+        self.errors = 0
+        self._window = (0, 0)   # (second, count) for the rate limit
+
+    def count(self, route):
+        with self.lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def throttle(self):
+        """Seconds to wait if this request is over the rate limit, else None."""
+        if not self.rate_limit:
+            return None
+        with self.lock:
+            now = time.monotonic()
+            second, n = self._window
+            if int(now) != second:
+                second, n = int(now), 0
+            n += 1
+            self._window = (second, n)
+            if n > self.rate_limit:
+                self.throttled += 1
+                return round(second + 1 - now, 3)
+        return None
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests = {}
+            self.throttled = 0
+            self.errors = 0
+
+    def fail(self):
+        """True if this request should get an injected 503."""
+        if self.error_rate and random.random() < self.error_rate:
+            with self.lock:
+                self.errors += 1
+            return True
+        return False
+
+
+def _handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, like the real APIs
+
+        def log_message(self, *args):
+            pass
+
+        # ─── helpers ────────────────────────────────────────────────────────
+        def _send(self, status, body=None, headers=None):
+            data = b"" if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode("utf-8"))
+            self.send_response(status)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            if body is not None and not isinstance(body, bytes):
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _body(self):
+            n = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(n) or b"{}") if n else {}
+
+        def _route(self, method):
+            url = urlparse(self.path)
+            parts = [p for p in url.path.split("/") if p]
+            route = f"{method} /{'/'.join(p if not p.isdigit() else '{id}' for p in parts)}"
+            state.count(route)
+            self._body_cache = self._body() if method in ("POST", "PUT") else None
+
+            if state.latency:
+                time.sleep(state.latency)
+
+            if url.path == REPORT_PATH:
+                return self._send(200, state.report, {"Content-Type": "text/html; charset=utf-8"})
+
+            wait = state.throttle()
+            if wait is not None:
+                return self._send(429, {"error": "rate limited"}, {"Retry-After": str(wait)})
+
+            if parts == ["auth", "tokens"] and method == "POST":
+                return self._send(200, {"auth_token": "bench-token", "user": {"email": "bench@local"}})
+            if state.fail():
+                return self._send(503, {"error": "injected failure"})
+            if not parts or parts[0] != CALENDAR_KEY:
+                return self._send(404, {"error": "unknown calendar"})
+            return self._calendar(method, parts[1:], parse_qs(url.query))
+
+        def _calendar(self, method, parts, query):
+            if parts == ["subcalendars"] and method == "GET":
+                return self._send(200, {"subcalendars": state.subcalendars})
+            if parts == ["subcalendars"] and method == "POST":
+                sc = {**self._body_cache, "id": 1000 + next(state.ids) + len(state.subcalendars)}
+                with state.lock:
+                    state.subcalendars.append(sc)
+                return self._send(201, {"subcalendar": sc})
+            if len(parts) == 2 and parts[0] == "subcalendars":
+                sid = int(parts[1])
+                with state.lock:
+                    match = [sc for sc in state.subcalendars if sc["id"] == sid]
+                    if not match:
+                        return self._send(404, {"error": "no such subcalendar"})
+                    if method == "DELETE":
+                        state.subcalendars.remove(match[0])
+                        return self._send(204)
+                    if method == "PUT":
+                        match[0].update(self._body_cache)
+                        return self._send(200, {"subcalendar": match[0]})
+
+            if parts == ["events"] and method == "GET":
+                start = query.get("startDate", ["0000"])[0]
+                end   = query.get("endDate", ["9999"])[0]
+                wanted = {int(s) for s in query.get("subcalendarId[]", [])}
+                with state.lock:
+                    events = [
+                        ev for ev in state.events.values()
+                        if start <= ev["start_dt"][:10] <= end
+                        and (not wanted or wanted & set(ev.get("subcalendar_ids") or []))
+                    ]
+                return self._send(200, {"events": events})
+            if parts == ["events"] and method == "POST":
+                ev = {**self._body_cache, "id": str(next(state.ids)), "version": "1"}
+                with state.lock:
+                    state.events[ev["id"]] = ev
+                return self._send(201, {"event": ev})
+            if len(parts) == 2 and parts[0] == "events":
+                with state.lock:
+                    ev = state.events.get(parts[1])
+                    if ev is None:
+                        return self._send(404, {"error": "no such event"})
+                    if method == "PUT":
+                        ev.update(self._body_cache, id=parts[1], version=str(int(ev["version"]) + 1))
+                        return self._send(200, {"event": ev})
+                    if method == "DELETE":
+                        del state.events[parts[1]]
+                        return self._send(204)
+            return self._send(404, {"error": "no such route"})
+
+        def do_GET(self):
+            self._route("GET")
+
+        def do_POST(self):
+            self._route("POST")
+
+        def do_PUT(self):
+            self._route("PUT")
+
+        def do_DELETE(self):
+            self._route("DELETE")
+
+    return Handler
+
+
+def start_mock_server(state, host="127.0.0.1", port=0):
+    """Serve `state` on a background thread; returns (server, base_url). Call server.shutdown() to stop."""
+    server = ThreadingHTTPServer((host, port), _handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
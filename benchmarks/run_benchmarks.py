@@ -0,0 +1,153 @@
+"""
+Offline benchmark of the push_latest_sb_data_to_teamup.py pipeline.
+
+Runs every stage against local stand-ins for Smartabase and TeamUp
+(benchmarks/mock_servers.py) on synthetic reports, and writes the timings
+to a JSON file so regressions show up before the nightly job does.
+
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 100000 \
+        --latency-ms 20 --rate-limit 50 --output bench_results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import date, datetime
+
+import pandas as pd
+import requests
+
+from benchmarks.mock_servers import MockState, start_mock_server, CALENDAR_KEY, REPORT_PATH
+from benchmarks.synthetic_report import synthetic_report
+from utils.pipeline_config import VENUE_LIST, GROUPS_TO_REMOVE
+from utils.pipeline import fetch_training_plan, prepare_table, build_projections
+from utils.instrumentation import METRICS
+from utils.sb_cache import ReportCache
+from utils.subcalendar_catalog import SubcalendarCatalog
+from utils.teamup_client import TeamUpClient
+from utils.state_store import EventStateStore
+from utils.push_journal import PushJournal
+from utils.sync_functions import sync_events, make_applier
+
+
+def collect(timings, prefix=""):
+    """Move the stage times METRICS gathered since the last call into `timings`."""
+    for name, seconds in METRICS.report()["stages_s"].items():
+        timings[prefix + name] = seconds
+    METRICS.reset()
+
+
+def bench_size(n, args):
+    timings, counts = {}, {}
+    start_date, end_date = args.start, args.end
+    METRICS.reset()
+
+    with METRICS.stage("generate_report"):
+        report = synthetic_report(n)
+    counts["report_bytes"] = len(report)
+    collect(timings)
+
+    state = MockState(latency=args.latency_ms / 1000.0, rate_limit=args.rate_limit, report=report,
+                      error_rate=args.error_rate)
+    server, base_url = start_mock_server(state)
+    report_url = f"{base_url}{REPORT_PATH}?report=PYTHON6_TRAINING_PLAN"
+    try:
+        session = requests.Session()
+        with tempfile.TemporaryDirectory() as tmp:
+            report_cache = ReportCache(os.path.join(tmp, "sb_report.json"))
+
+            # ─── Smartabase: whole download + read_html ─────────────────────
+            # (the same fetch the nightly job runs: retries, conditional GET, stage timers)
+            data = fetch_training_plan(session, report_url, start_date, end_date, GROUPS_TO_REMOVE,
+                                       report_cache, stream=False)
+            counts["rows_parsed"] = len(data)
+            collect(timings, "whole_")
+
+            # ─── Smartabase: streamed fetch + parse with early filtering ────
+            data = fetch_training_plan(session, report_url, start_date, end_date, GROUPS_TO_REMOVE,
+                                       report_cache, stream=True)
+            counts["rows_streamed"] = len(data)
+
+            # ─── Clean, time conversion, payloads ───────────────────────────
+            df = prepare_table(data, start_date, end_date, GROUPS_TO_REMOVE, VENUE_LIST)
+            counts["rows_clean"] = len(df)
+
+            client = TeamUpClient("bench", CALENDAR_KEY, "bench@local", "bench", base_url=base_url,
+                                  pool_size=max(args.workers, 16))
+            with METRICS.stage("catalog"):
+                catalog = SubcalendarCatalog.fetch(client, ttl=0)
+            with contextlib.redirect_stdout(io.StringIO()):
+                events = build_projections(df, catalog, coalesce=True)["coalesced"]
+            counts["events_coalesced"] = len(events)
+
+            # ─── TeamUp: initial push, then a no-change sync ────────────────
+            desired = events[:args.push_limit]
+            counts["events_pushed"] = len(desired)
+            store = EventStateStore(os.path.join(tmp, "state.sqlite"))
+            journal = PushJournal(os.path.join(tmp, "journal.json"), os.path.join(tmp, "dead.ndjson"))
+            apply_ops = make_applier(client, workers=args.workers, rate=args.rate, store=store)
+
+            state.reset_stats()
+            with METRICS.stage("push"), contextlib.redirect_stdout(io.StringIO()):
+                plan = sync_events(client, desired, start_date, end_date, apply_ops, store=store, journal=journal)
+            counts["push_failed"] = plan["failed"]
+            counts["push_requests"] = sum(state.requests.values())
+            counts["push_429s"] = state.throttled
+            counts["push_503s"] = state.errors
+
+            state.reset_stats()
+            with METRICS.stage("sync_noop"), contextlib.redirect_stdout(io.StringIO()):
+                sync_events(client, desired, start_date, end_date, apply_ops, store=store, journal=journal)
+            counts["sync_noop_requests"] = sum(state.requests.values())
+            store.close()
+            client.close()
+            collect(timings)
+    finally:
+        server.shutdown()
+
+    if timings.get("push"):
+        counts["push_events_per_s"] = round(len(desired) / timings["push"], 1)
+    return {"rows": n, "stages": timings, "counts": counts}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="added to every mock response")
+    parser.add_argument("--rate-limit", type=float, default=50.0, help="mock TeamUp requests/s before 429 (0 = none)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of mock TeamUp calls answered 503")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=20.0, help="initial push rate (req/s)")
+    parser.add_argument("--push-limit", type=int, default=1000, help="max events pushed per size")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2025, 5, 11))
+    parser.add_argument("--end", type=date.fromisoformat, default=date(2025, 12, 31))
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n in args.sizes:
+        print(f"▶︎ {n} rows …", flush=True)
+        res = bench_size(n, args)
+        results.append(res)
+        print("   " + "  ".join(f"{k}={v:.3f}s" for k, v in res["stages"].items()))
+        print("   " + "  ".join(f"{k}={v}" for k, v in res["counts"].items()))
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python":       sys.version.split()[0],
+        "pandas":       pd.__version__,
+        "platform":     platform.platform(),
+        "config":       {k: str(v) for k, v in vars(args).items()},
+        "results":      results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"▶︎ Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# ─── SYNTHETIC SMARTABASE REPORTS ───────────────────────────────────────────
+import random
+from datetime import date, timedelta
+from html import escape
+
+from utils.pipeline_config import VENUE_LIST, GROUPS_TO_REMOVE, STRUCTURE_CSV
+from utils.structure_functions import load_structure
+
+COLUMNS = [
+    "About", "Date", "Date Reverse", "Day", "AM/PM", "Training Group", "Sport",
+    "Venue", "Session Type", "Start Time", "Finish Time", "Academic Year", "by"
+]
+SESSION_TYPES = ["Strength", "Conditioning", "Technical", "Recovery", "Speed", ""]
+SPORTS = ["Athletics", "Fencing", "Squash", "Padel", "Swimming", "Table Tennis"]
+
+
+def _sb_time(minute_of_day):
+    # Smartabase stores times as ms epoch shifted by the +12h that convert_to_time removes
+    return (minute_of_day + 12 * 60) * 60 * 1000
+
+
+def generate_rows(n, start=date(2023, 9, 1), end=date(2026, 6, 30), seed=42):
+    """
+    n report rows shaped like PYTHON6_TRAINING_PLAN: mostly real groups and
+    venues, plus a share of rows every filter should drop (excluded groups,
+    Practice, Generic_Athlete, AASMC, blank sport, unknown venue).
+    """
+    rnd = random.Random(seed)
+    groups = [sc["name"].rsplit(">", 1)[1].strip() for sc in load_structure(STRUCTURE_CSV)
+              if sc["name"].startswith("Sport >")]
+    venues = [v for v in VENUE_LIST if v != "_MISSING"]
+    span = (end - start).days
+
+    for _ in range(n):
+        day = start + timedelta(days=rnd.randrange(span))
+        begin = rnd.randrange(6 * 60, 20 * 60, 15)
+        noise = rnd.random()
+        yield {
+            "About":          "Training Plan",
+            "Date":           day.strftime("%d/%m/%Y"),
+            "Date Reverse":   day.strftime("%Y/%m/%d"),
+            "Day":            day.strftime("%A"),
+            "AM/PM":          "AM" if begin < 12 * 60 else "PM",
+            "Training Group": rnd.choice(GROUPS_TO_REMOVE + ["Practice"]) if noise < 0.05 else rnd.choice(groups),
+            "Sport":          "Generic_Athlete" if noise > 0.97 else ("" if 0.95 < noise <= 0.97 else rnd.choice(SPORTS)),
+            "Venue":          "AASMC" if 0.05 <= noise < 0.07 else ("Somewhere Else" if 0.07 <= noise < 0.09 else rnd.choice(venues)),
+            "Session Type":   rnd.choice(SESSION_TYPES),
+            "Start Time":     _sb_time(begin),
+            "Finish Time":    _sb_time(begin + rnd.choice([45, 60, 90, 120])),
+            "Academic Year":  f"{day.year}/{day.year + 1}",
+            "by":             "bench",
+        }
+
+
+def render_html(rows):
+    """The report as Smartabase serves it: one HTML page with a single table."""
+    parts = ["<html><body><table><thead><tr>"]
+    parts.extend(f"<th>{escape(c)}</th>" for c in COLUMNS)
+    parts.append("</tr></thead><tbody>")
+    for row in rows:
+        parts.append("<tr>" + "".join(f"<td>{escape(str(row[c]))}</td>" for c in COLUMNS) + "</tr>")
+    parts.append("</tbody></table></body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+def synthetic_report(n, seed=42):
+    return render_html(generate_rows(n, seed=seed))
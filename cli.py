@@ -0,0 +1,63 @@
+"""
+One entry point for the Smartabase → TeamUp jobs:
+
+    python cli.py sync [--daemon] …    sync the training plan to TeamUp
+    python cli.py plan PATH …          dry run: write the event set to PATH
+    python cli.py structure [--prune]  make the sub-calendars match the CSV
+    python cli.py list                 print the sub-calendars
+    python cli.py purge [--dry-run]    delete all but the preserved sub-calendars
+
+Only the chosen command's module is imported, and nothing logs in or
+downloads until the command runs – so `list` never loads pandas.
+"""
+import argparse
+import importlib
+import sys
+
+# command → (module, help, add_arguments keywords)
+COMMANDS = {
+    "sync":      ("push_latest_sb_data_to_teamup", "sync the Smartabase training plan to TeamUp",
+                  {"hide": ("--sync", "--plan")}),
+    "plan":      ("push_latest_sb_data_to_teamup", "dry run: build the events and write them to a file",
+                  {"hide": ("--sync", "--plan", "--daemon", "--interval", "--hot-every", "--redrive",
+                            "--batch-size", "--refresh-state", "--workers", "--rate",
+                            "--hot-past-days", "--hot-future-days")}),
+    "structure": ("create_sub_calendar_structure", "make the TeamUp sub-calendars match the structure CSV", {}),
+    "list":      ("list_subcalendars",             "print every TeamUp sub-calendar", {}),
+    "purge":     ("delete_all_sub_calendars",      "delete every sub-calendar except the preserved ones", {}),
+}
+
+
+def build_parser(command=None):
+    """The CLI parser; only `command`'s own options are loaded (its module imported)."""
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subs = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+    for name, (module, help, options) in COMMANDS.items():
+        sub = subs.add_parser(name, help=help, description=help)
+        if name != command:
+            continue
+        if name == "plan":
+            sub.add_argument("plan_path", metavar="PATH", help="output file (.ndjson, or .parquet)")
+        importlib.import_module(module).add_arguments(sub, **options)
+        if name == "sync":
+            sub.set_defaults(sync=True)
+    return parser
+
+
+def main(argv=None):
+    from utils.pipeline_config import load_env
+
+    load_env()   # before the parsers: option defaults come from the environment
+    argv = sys.argv[1:] if argv is None else argv
+    command = next((a for a in argv if not a.startswith("-")), None)
+    args = build_parser(command if command in COMMANDS else None).parse_args(argv)
+
+    if args.command == "plan":
+        args.plan = args.plan_path
+    return importlib.import_module(COMMANDS[args.command][0]).run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
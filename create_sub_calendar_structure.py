@@ -1,64 +1,47 @@
-from dotenv import load_dotenv
-import os
-import requests
-import csv
-load_dotenv()
-# ─── 1) Load your Teamup API token + calendar key from .env ──────────────────
-# load_dotenv("c:/Users/Jack.Andrew/Downloads/teamup/.env", override=True)
-API_TOKEN     = os.getenv("TEAMUP_TOKEN")         # ← your calendar-level key
-CALENDAR_KEY  = os.getenv("TEAMUP_CALENDAR_KEY")  # ← e.g. "oahota"
-TEAM_EMAIL = os.getenv("TEAMUP_EMAIL")  
-TEAM_PASSWORD = os.getenv("TEAMUP_PASSWORD")
+import argparse
+import sys
 
-# ─── 2) Authenticate once to get your user token ─────────────────────────────
-auth_resp = requests.post(
-    "https://api.teamup.com/auth/tokens",
-    headers={
-        "Teamup-Token": API_TOKEN,
-        "Content-Type":  "application/json",
-        "Accept":        "application/json"
-    },
-    json={
-        "app_name":  "My awesome app",
-        "device_id": "Jack's Laptop",
-        "email":     os.getenv("TEAMUP_EMAIL"),      # or hard-code
-        "password":  os.getenv("TEAMUP_PASSWORD")    # or hard-code
-    }
-)
-auth_resp.raise_for_status()
-user_token = auth_resp.json()["auth_token"]
-print("▶︎ Authenticated, user token:", user_token)
+from utils.pipeline_config import STRUCTURE_CSV, load_env
+from utils.push_engine import DEFAULT_WORKERS, DEFAULT_RATE
 
-# # ─── 3) Read your CSV and create each sub-calendar ────────────────────────────
-# CSV_PATH = "Venue and Group Calendar Structure.csv"
 
-# with open(CSV_PATH, newline="", encoding="utf-8-sig") as f:
-#     reader = csv.DictReader(f)
-#     for row in reader:
-#         name     = row["Calendar Name"]
-#         color    = int(row["Color Id"])
-#         overlap  = bool(int(row["Allow Overlap"]))  # 1 → True, 0 → False
+# ─── 0) Options ───────────────────────────────────────────────────────────────
+# Safe to re-run: only missing sub-calendars are created and only colour /
+# overlap drift is patched. Sub-calendars not in the CSV are listed, and
+# deleted only with --prune (the preserved ones never are).
+def add_arguments(parser):
+    parser.add_argument("--csv", default=STRUCTURE_CSV, help="structure CSV (Calendar Name, Color Id, Allow Overlap)")
+    parser.add_argument("--prune", action="store_true", help="delete sub-calendars that are not in the CSV")
+    parser.add_argument("--dry-run", action="store_true", help="only print what would change")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent TeamUp requests")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="initial TeamUp requests/second")
+    return parser
 
-#         payload = {
-#             "name":    name,
-#             "active":  True,
-#             "color":   color,
-#             "overlap": overlap,
-#             "type":    0
-#         }
 
-#         resp = requests.post(
-#             f"https://api.teamup.com/{CALENDAR_KEY}/subcalendars",
-#             headers={
-#                 "Teamup-Token":  API_TOKEN,
-#                 "Authorization": f"Bearer {user_token}",
-#                 "Content-Type":  "application/json",
-#                 "Accept":        "application/json"
-#             },
-#             json=payload
-#         )
+def run(args):
+    from utils.teamup_client import client_from_env
+    from utils.pipeline_config import preserved_subcalendars
+    from utils.structure_functions import reconcile_structure
 
-#         if resp.ok:
-#             print(f"✓ Created “{name}” (color={color}, overlap={overlap})")
-#         else:
-#             print(f"✗ Failed “{name}”: {resp.status_code} {resp.text}")
+    load_env()
+
+    # ─── 1) Get an authenticated TeamUp client (token + calendar key from .env) ──
+    client = client_from_env(pool_size=max(args.workers, 16))
+
+    # ─── 2) Reconcile the live sub-calendars with the CSV ─────────────────────────
+    result = reconcile_structure(
+        client, args.csv, preserved=preserved_subcalendars(), prune=args.prune,
+        dry_run=args.dry_run, workers=args.workers, rate=args.rate
+    )
+    client.close()
+    return 1 if result["failed"] else 0
+
+
+def main(argv=None):
+    load_env()
+    parser = add_arguments(argparse.ArgumentParser(description="Make the TeamUp sub-calendars match the structure CSV."))
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
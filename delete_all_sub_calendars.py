@@ -1,57 +1,58 @@
-from dotenv import load_dotenv
-import os
-import requests
-
-from utils.teamup_functions import delete_subcalendar, list_all_subcalendars
-
-# Get Authorization token ──────────────────────────────────────────────────────────
-load_dotenv(override=True)
-API_TOKEN    = os.getenv("TEAMUP_TOKEN")         # ← calendar API key
-CALENDAR_KEY = os.getenv("TEAMUP_CALENDAR_KEY")  # ← e.g. "oahota"
-TEAM_EMAIL = os.getenv("TEAMUP_EMAIL")  
-TEAM_PASSWORD = os.getenv("TEAMUP_PASSWORD")
-
-# 2) log in to get your user token
-auth_resp = requests.post(
-    "https://api.teamup.com/auth/tokens",
-    headers={
-        "Teamup-Token": API_TOKEN,
-        "Content-Type":  "application/json",
-        "Accept":        "application/json"
-    },
-    json={
-        "app_name":  "Aspire Sports Department Calendar",
-        "device_id": "Jacks Laptop",
-        "email":     TEAM_EMAIL,
-        "password": TEAM_PASSWORD
-    }
-)
-auth_resp.raise_for_status()
-user_token = auth_resp.json().get("auth_token")   # ← this is your Bearer token
-print("▶︎ User token:", user_token)
-# ─────────────────────────────────────────────────────────────────────────────────────
-
-BASE_URL = "https://api.teamup.com"
-HEADERS  = {
-    "Teamup-Token":  API_TOKEN,
-    "Content-Type":  "application/json",
-    "Authorization": f"Bearer {user_token}"
-}
+import argparse
+import sys
 
+from utils.pipeline_config import load_env
+from utils.push_engine import DEFAULT_WORKERS, DEFAULT_RATE
 
-if __name__ == "__main__":
-    subcal_data = list_all_subcalendars(BASE_URL, CALENDAR_KEY, HEADERS)
-    sub_calendar_ids = [item["id"] for item in subcal_data]
-    filtered_sub_calendar_ids = [id for id in sub_calendar_ids if id not in [14217582, 15155825,15166082]]
 
-    # Exclude the last calendar from deletion
-    ids_to_delete = filtered_sub_calendar_ids
-    print("Will delete these IDs (keeping id: 15155825, 14217582):", ids_to_delete) #barney calendar is kept
+def add_arguments(parser):
+    parser.add_argument("--dry-run", action="store_true", help="only print the ids that would be deleted")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent TeamUp requests")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="initial TeamUp requests/second")
+    return parser
+
+
+def run(args):
+    from utils.teamup_client import client_from_env
+    from utils.teamup_functions import delete_subcalendar, list_all_subcalendars
+    from utils.subcalendar_catalog import SubcalendarCatalog
+    from utils.pipeline_config import preserved_subcalendars
+    from utils.structure_functions import is_preserved
+    from utils.push_engine import push_events
+
+    load_env()
+    preserved = preserved_subcalendars()
 
-    for sub_id in ids_to_delete:
-        delete_subcalendar(BASE_URL, CALENDAR_KEY, HEADERS, sub_id)
+    # Get an authenticated TeamUp client ────────────────────────────────────────────
+    client = client_from_env()
+    # ─────────────────────────────────────────────────────────────────────────────────
 
+    subcal_data = list_all_subcalendars(client)
 
+    # keep the preserved calendars (barney calendar is kept) – see preserved_subcalendars
+    ids_to_delete = [item["id"] for item in subcal_data if not is_preserved(item, preserved)]
+    print(f"Will delete these IDs (keeping {', '.join(preserved)}):", ids_to_delete)
+    if args.dry_run:
+        return 0
 
+    results = push_events(ids_to_delete, lambda sub_id: delete_subcalendar(client, sub_id),
+                          workers=args.workers, rate=args.rate)
+    failed = [r["event"] for r in results if r["status"] != "ok"]
+    if failed:
+        print(f"❌ {len(failed)} sub-calendar(s) could not be deleted: {failed}")
 
+    # the structure changed – don't let other scripts reuse a cached list
+    SubcalendarCatalog.invalidate(client)
+    return 1 if failed else 0
 
+
+def main(argv=None):
+    load_env()
+    parser = add_arguments(argparse.ArgumentParser(
+        description="Delete every TeamUp sub-calendar except the preserved ones (and all their events)."
+    ))
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
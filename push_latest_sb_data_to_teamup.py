@@ -1,259 +1,329 @@
-import requests
-import pandas as pd
-from io import StringIO
-from datetime import datetime, timedelta, timezone
-from dotenv import load_dotenv
-import os
-import json
-import hashlib
-import time
-from utils.sb_functions import convert_to_time
-from utils.teamup_functions import (
-    list_all_subcalendars,
-    list_training_group_subcalendars,
-    list_venue_subcalendars,
-    parse_iso,
-    make_version,
-    add_event_to_sub_calendar
-)
-
-### Overview ###
-
-# Step 1: Get SB data
-# Step 2: Merge on sub calendar
-# Step 3: Push to Team Up
-
-# ─── DATE RANGE ─────────────────────────────────────────────────────────────
-# (adjust to whatever window you need)
-start_date = datetime(2025, 5, 11).date()
-end_date   = datetime(2025, 12, 31).date()
-
-# ─── Fetch & parse ──────────────────────────────────────────────────────────
-load_dotenv(override=True)
-SB_USERNAME   = os.getenv("SB_USERNAME")     
-SB_PASSWORD = os.getenv("SB_PASSWORD")
-
-session = requests.Session()
-session.auth = (SB_USERNAME, SB_PASSWORD)
-
-url = (
-    "https://aspire.smartabase.com/aspireacademy/live"
-    "?report=PYTHON6_TRAINING_PLAN&updategroup=true"
-)
-response = session.get(url)
-response.raise_for_status()
-
-# read first HTML table
-tables = pd.read_html(response.text)
-if not tables:
-    raise ValueError("No HTML tables found in the response")
-data = tables[0]
-
-# ─── Clean up ───────────────────────────────────────────────────────────────
-venue_list = [
-    "Basement Track", "Blue Ice", "Fencing Hall", "Gym A", "Gym B", "Gym C",
-    "Indoor Track", "Khalifa Stadium", "MPH 1", "Outdoor Throws", "Outdoor Track",
-    "PadelIN", "Physiology Lab", "Sand Court", "Sport Psychology Suite Common Area",
-    "Squash Courts", "Swimming Pool", "Table Tennis Hall", "MPH 2",
-    "Aspire Park", "Federation", "FPC Pitch","_MISSING"
-]
-
-groups_to_remove = ["Jumps_Linus", "Jumps_Pawel", "Decathlon_Willem","Endurance_Driss","Endurance_Kada","Endurance_Khamis","Sprints_Francis","Sprints_Yasmani","Sprints_Rafal","Throws_Keida","Throws_Krzysztof"]
-
-df = (
-    data
-    .drop(columns=['About', 'by', 'Academic Year', 'Day AM/PM', 'AM/PM', 'Day', 'Date Reverse'], errors='ignore')
-    .drop_duplicates()
-    .rename(columns=lambda c: c.strip().replace(' ', '_'))
-)
-# Strip spaces and standardize case just in case
-df['Training_Group'] = df['Training_Group'].astype(str).str.strip()
-df = df[~df['Training_Group'].isin(groups_to_remove)]
-
-# Parse dates
-df['Date'] = pd.to_datetime(df['Date'], errors='coerce', dayfirst=True).dt.date
-
-# Restrict to your window
-df = df[(df['Date'] >= start_date) & (df['Date'] <= end_date)]
-
-# Convert times
-df['Start_Time']  = pd.to_numeric(df['Start_Time'],  errors='coerce').apply(convert_to_time)
-df['Finish_Time'] = pd.to_numeric(df['Finish_Time'], errors='coerce').apply(convert_to_time)
-
-# Filter out unwanted rows
-df = df[
-    df['Sport'].notna() 
-    & (df['Sport'].str.strip() != '') 
-    & (df['Venue'] != 'AASMC') 
-    & (df['Sport'] != 'Generic_Athlete') 
-    & (df['Training_Group'] != 'Practice')
-]
-
-
-
-
-# Fill NA text fields
-df['Session_Type'] = df['Session_Type'].fillna('').astype(str)
-
-# Venue clean-up
-df['Venue'] = df['Venue'].fillna('_MISSING')
-df['Venue'] = df['Venue'].apply(lambda v: v if v in venue_list else '_OTHER')
-
-# Output
-# df.to_csv('invetsigate_group_structure.csv', index=False)
-
-# ─── GET SUB CALENDAR INFO ─────────────────────────────
-
-# Get Authorization token ──────────────────────────────────────────────────────────
-load_dotenv(override=True)
-API_TOKEN    = os.getenv("TEAMUP_TOKEN")         # ← calendar API key
-CALENDAR_KEY = os.getenv("TEAMUP_CALENDAR_KEY") # ← e.g. "oahota"
-TEAM_EMAIL = os.getenv("TEAMUP_EMAIL")  
-TEAM_PASSWORD = os.getenv("TEAMUP_PASSWORD")
-
-# 2) log in to get your user token
-auth_resp = requests.post(
-    "https://api.teamup.com/auth/tokens",
-    headers={
-        "Teamup-Token": API_TOKEN,
-        "Content-Type":  "application/json",
-        "Accept":        "application/json"
-    },
-    json={
-        "app_name":  "My awesome new app",
-        "device_id": "Jacks Laptop",
-        "email":     TEAM_EMAIL,
-        "password": TEAM_PASSWORD
-    }
-)
-auth_resp.raise_for_status()
-user_token = auth_resp.json().get("auth_token")   # ← this is your Bearer token
-print("▶︎ User token:", user_token)
-# ─────────────────────────────────────────────────────────────────────────────────────
-
-BASE_URL = "https://api.teamup.com"
-HEADERS  = {
-    "Teamup-Token":  API_TOKEN,
-    "Content-Type":  "application/json",
-    "Authorization": f"Bearer {user_token}"
-}
-
-# ─── 1) Fetch subcalendar list & build lookup by Training Group ──────────────
-tg_subcals = list_training_group_subcalendars(BASE_URL, CALENDAR_KEY, HEADERS)
-lookup = {}
-for rec in tg_subcals:
-    tg  = rec["Training Group"]
-    sid = rec["id"]
-    if tg:
-        lookup.setdefault(tg, []).append(sid)
-
-
-# ─── Build JSON for by training group ───────────────────────────────
-TZ_OFFSET = "+03:00"
-TZ_NAME   = "Asia/Riyadh"
-# df = pd.read_csv("test_sb_export_via_excel.csv")
-tg_out = []
-for _, row in df.iterrows():
-    tg           = row["Training_Group"]
-    session_type = row["Session_Type"] or ""
-    venue        = row["Venue"] or ""
-    subs         = lookup.get(tg, [])
-    subcal_id    = subs[0] if subs else None
-
-    # construct title exactly like your sample
-    title = f"{session_type} – {tg}" if session_type else tg
-
-    start_iso = parse_iso(row["Date"],       row["Start_Time"])
-    end_iso   = parse_iso(row["Date"],       row["Finish_Time"])
-
-    rec = {
-        "subcalendar_id":  subcal_id,
-        "subcalendar_ids": subs,
-        "start_dt":        start_iso,
-        "end_dt":          end_iso,
-        "all_day":         False,
-        "title":           title,
-        "location":        venue,
-        "version":         make_version(subcal_id, start_iso, end_iso),
-        "readonly":        False,
-        "tz":              TZ_NAME,
-        "attachments":     []
-    }
-    tg_out.append(rec)
-
-    # # write out in the same shape as converted.json
-    # with open("NEW_Converted_from_csv.json", "w", encoding="utf-8") as f:
-    #     json.dump(tg_out, f, indent=4, ensure_ascii=False)
-
-    # print(f"Converted {len(tg_out)} events → converted_from_csv.json")
-
-
-# ─── PUSH TG EVENTS TO CALENDAR ─────────────────────────────
-for ev in tg_out:
-
-    try:
-        created = add_event_to_sub_calendar(BASE_URL, CALENDAR_KEY, HEADERS, ev)
-        print(f"[OK]   Created: {ev['title']} @ {ev['start_dt']}")
-    except Exception as err:
-        print(f"[FAIL] {ev['title']}  — {err}")
-    # be kind to the API:
-    time.sleep(0.2)
-
-# ─── Build JSON for by venue ────────────────────────────
-#df = pd.read_csv("test_sb_export_via_excel.csv")
-ven_subcals = list_venue_subcalendars(BASE_URL, CALENDAR_KEY, HEADERS)
-lookup = {}
-for rec in ven_subcals:
-    ven  = rec["Venue"]
-    sid = rec["id"]
-    if ven:
-        lookup.setdefault(ven, []).append(sid)
-
-
-ven_out = []
-for _, row in df.iterrows():
-    ven           = row["Venue"]
-    tg            = row["Training_Group"]
-    session_type = row["Session_Type"] or ""
-    venue        = row["Venue"] or ""
-    subs         = lookup.get(ven, [])
-    subcal_id    = subs[0] if subs else None
-
-    # construct title exactly like your sample
-    title = f"{tg} - {session_type}" if session_type else tg
-
-    start_iso = parse_iso(row["Date"],       row["Start_Time"])
-    end_iso   = parse_iso(row["Date"],       row["Finish_Time"])
-
-    rec = {
-        "subcalendar_id":  subcal_id,
-        "subcalendar_ids": subs,
-        "start_dt":        start_iso,
-        "end_dt":          end_iso,
-        "all_day":         False,
-        "title":           title,
-        "location":        venue,
-        "version":         make_version(subcal_id, start_iso, end_iso),
-        "readonly":        False,
-        "tz":              TZ_NAME,
-        "attachments":     []
-    }
-    ven_out.append(rec)
-
-    # write out in the same shape as converted.json
-    with open("NEW_VENUE_Converted_from_csv.json", "w", encoding="utf-8") as f:
-        json.dump(ven_out, f, indent=4, ensure_ascii=False)
-
-    print(f"Converted {len(ven_out)} events → converted_from_csv.json")
-
-# ─── PUSH VENUE EVENTS TO CALENDAR ─────────────────────────────
-for ev in ven_out:
-
-    try:
-        created = add_event_to_sub_calendar(BASE_URL, CALENDAR_KEY, HEADERS, ev)
-        print(f"[OK]   Created: {ev['title']} @ {ev['start_dt']}")
-    except Exception as err:
-        print(f"[FAIL] {ev['title']}  — {err}")
-    # be kind to the API:
-    time.sleep(0.2)
-
+"""
+Push the Smartabase training plan to TeamUp.
+
+Step 1: Get SB data
+Step 2: Merge on sub calendar
+Step 3: Push to Team Up (or, with --sync, only the differences)
+
+Run it directly or as `python cli.py sync` / `python cli.py plan PATH`.
+Nothing happens at import time; pandas, the Smartabase download and the
+TeamUp login are only loaded / done once a run needs them.
+"""
+import argparse
+import sys
+from datetime import date
+
+from utils.push_engine import DEFAULT_WORKERS, DEFAULT_RATE
+from utils.push_journal import DEFAULT_BATCH_SIZE
+from utils.pipeline_config import load_env, season, hot_window_days, DAEMON_INTERVAL, DAEMON_HOT_EVERY
+
+
+def add_arguments(parser, hide=()):
+    """
+    Add the options to `parser`; those named in `hide` still parse but aren't
+    listed in --help. The defaults come from the environment, so load_env()
+    first.
+    """
+    season_start, season_end = season()
+    hot_past, hot_future = hot_window_days()
+
+    def add(flag, **kwargs):
+        if flag in hide:
+            kwargs["help"] = argparse.SUPPRESS
+        parser.add_argument(flag, **kwargs)
+
+    add(
+        "--sync", action="store_true",
+        help="diff against the events already in TeamUp and only create/update/delete what changed"
+    )
+    add(
+        "--start", type=date.fromisoformat, default=season_start,
+        help=f"first day of the window, YYYY-mm-dd (default {season_start})"
+    )
+    add(
+        "--end", type=date.fromisoformat, default=season_end,
+        help=f"last day of the window, YYYY-mm-dd (default {season_end})"
+    )
+    add(
+        "--hot-past-days", type=int, default=hot_past,
+        help=f"with --sync, weeks from today minus this many days are always reconciled (default {hot_past})"
+    )
+    add(
+        "--hot-future-days", type=int, default=hot_future,
+        help=f"… up to today plus this many days (default {hot_future}); "
+             "other weeks are only synced when their data changed"
+    )
+    add(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"concurrent TeamUp requests (default {DEFAULT_WORKERS})"
+    )
+    add(
+        "--rate", type=float, default=DEFAULT_RATE,
+        help=f"initial requests/second; adapted from 429/Retry-After (default {DEFAULT_RATE})"
+    )
+    add(
+        "--no-stream", action="store_true",
+        help="download the whole Smartabase report and parse it with pd.read_html"
+    )
+    add(
+        "--force", action="store_true",
+        help="push even if the Smartabase report looks unchanged since the last successful run "
+             "(with --sync: reconcile every week of the window)"
+    )
+    add(
+        "--refresh-state", action="store_true",
+        help="re-list every week of the window from TeamUp instead of trusting the local state store"
+    )
+    add(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+        help=f"operations per journal checkpoint (default {DEFAULT_BATCH_SIZE})"
+    )
+    add(
+        "--no-coalesce", action="store_true",
+        help="push one event per row and projection instead of merging identical sessions "
+             "(same start, end, title, location) into one multi-subcalendar event"
+    )
+    add(
+        "--overlaps", choices=["skip", "report", "off"], default="skip",
+        help="events that would clash in a subcalendar without 'Allow Overlap': "
+             "skip them before any request (default), only report them, or don't check"
+    )
+    add(
+        "--redrive", action="store_true",
+        help="only re-push the operations in the dead-letter queue, then exit"
+    )
+    add(
+        "--plan", metavar="PATH",
+        help="dry run: build both projections, write them once to PATH (.ndjson, or .parquet) "
+             "and report counts without pushing anything"
+    )
+    add(
+        "--daemon", action="store_true",
+        help="keep running: poll Smartabase every --interval seconds and sync only what changed "
+             "(implies --sync; Ctrl-C / SIGTERM stop after the current cycle)"
+    )
+    add(
+        "--interval", type=float, default=DAEMON_INTERVAL,
+        help=f"daemon poll interval in seconds (default {DAEMON_INTERVAL})"
+    )
+    add(
+        "--hot-every", type=float, default=DAEMON_HOT_EVERY,
+        help=f"daemon: re-list the hot window from TeamUp every this many seconds (default {DAEMON_HOT_EVERY})"
+    )
+    add(
+        "--report", metavar="PATH",
+        help="write a JSON run report (stage timings, HTTP counts, status codes, latency percentiles)"
+    )
+    add(
+        "--profile", metavar="PATH",
+        help="profile the whole run with cProfile and dump the stats to PATH"
+    )
+    return parser
+
+
+def run(args):
+    """One run (or, with --daemon, the polling loop); returns the exit code."""
+    import os
+    import atexit
+    import cProfile
+
+    import requests
+
+    from utils.pipeline import (
+        fetch_training_plan,
+        prepare_table,
+        changed_weeks,
+        build_projections,
+        check_overlaps,
+        sync_weeks
+    )
+    from utils.payload_functions import write_plan, summarize_plan
+    from utils.sync_functions import make_applier, diff_events
+    from utils.push_journal import PushJournal
+    from utils.state_store import EventStateStore
+    from utils.teamup_client import client_from_env, DEFAULT_POOL_SIZE
+    from utils.subcalendar_catalog import SubcalendarCatalog
+    from utils.sb_cache import ReportCache
+    from utils.instrumentation import METRICS
+    from utils.resilience import CircuitBreaker
+    from utils.daemon import PollingDaemon
+    from utils.partition_functions import hot_window
+    from utils.pipeline_config import sb_report_url, VENUE_LIST, GROUPS_TO_REMOVE
+
+    load_env()
+    if args.daemon:
+        args.sync = True
+
+
+    # ─── Instrumentation (written on every exit path, incl. early returns) ──
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        atexit.register(lambda: (profiler.disable(), profiler.dump_stats(args.profile),
+                                 print(f"▶︎ cProfile stats → {args.profile}")))
+    if args.report and not args.daemon:   # (the daemon writes one per cycle)
+        atexit.register(METRICS.write_report, args.report)
+
+    # ─── RE-DRIVE DEAD LETTERS ONLY ─────────────────────────────────────────
+    if args.redrive:
+        client = client_from_env(pool_size=max(args.workers, DEFAULT_POOL_SIZE))
+        store = EventStateStore.for_calendar(client.calendar_key)
+        results = PushJournal(batch_size=args.batch_size).redrive(
+            make_applier(client, workers=args.workers, rate=args.rate, store=store)
+        )
+        store.close()
+        return 1 if any(r["status"] != "ok" for r in results) else 0
+
+    # ─── DATE RANGE ─────────────────────────────────────────────────────────
+    # (--start / --end, defaults in utils/pipeline_config.py)
+    start_date = args.start
+    end_date   = args.end
+
+    # ─── Filters ────────────────────────────────────────────────────────────
+    # (venue / training-group lists live in utils/pipeline_config.py)
+    venue_list       = VENUE_LIST
+    groups_to_remove = GROUPS_TO_REMOVE
+
+    # ─── Fetch & parse ──────────────────────────────────────────────────────
+    SB_USERNAME   = os.getenv("SB_USERNAME")     
+    SB_PASSWORD = os.getenv("SB_PASSWORD")
+
+    session = requests.Session()
+    session.auth = (SB_USERNAME, SB_PASSWORD)
+    METRICS.instrument_session(session, "smartabase")
+
+    url = sb_report_url()
+    # validators / fingerprints of the last successful run (skipped with --force / --plan)
+    report_cache = ReportCache()
+
+    # ─── DAEMON: poll and push deltas until stopped ─────────────────────────
+    if args.daemon:
+        client = client_from_env(pool_size=max(args.workers, DEFAULT_POOL_SIZE))
+        store = EventStateStore.for_calendar(client.calendar_key)
+        daemon = PollingDaemon(
+            client, session, url, report_cache, store,
+            journal=PushJournal(batch_size=args.batch_size),
+            apply_ops=make_applier(client, workers=args.workers, rate=args.rate, store=store),
+            opts={
+                "start": start_date, "end": end_date,
+                "groups_to_remove": groups_to_remove, "venue_list": venue_list,
+                "stream": not args.no_stream, "coalesce": not args.no_coalesce, "overlaps": args.overlaps,
+                "hot_days": (args.hot_past_days, args.hot_future_days),
+            },
+            interval=args.interval, hot_every=args.hot_every, report_path=args.report
+        )
+        daemon.install_signal_handlers()
+        daemon.run()
+        store.close()
+        client.close()
+        return 0
+
+    # a sync always reconciles the hot window, so it needs the report even when unchanged
+    hot = hot_window(args.hot_past_days, args.hot_future_days)
+    hot_due = args.sync and hot is not None and hot[0] <= end_date and hot[1] >= start_date
+    conditional = {} if args.force or args.plan or hot_due else report_cache.conditional_headers(url)
+    data = fetch_training_plan(session, url, start_date, end_date, groups_to_remove, report_cache,
+                               conditional, stream=not args.no_stream, breaker=CircuitBreaker("smartabase"))
+    if data is None:
+        print("▶︎ Smartabase report not modified since the last successful run – nothing to push")
+        return 0
+
+    # ─── Clean up ───────────────────────────────────────────────────────────
+    df = prepare_table(data, start_date, end_date, groups_to_remove, venue_list)
+
+    # Output
+    # df.to_csv('invetsigate_group_structure.csv', index=False)
+
+    # ─── Anything changed since the last successful run? ────────────────────
+    changed = changed_weeks(df, report_cache)
+    if not changed and not args.force and not args.plan and not hot_due:
+        print("▶︎ Training plan unchanged for every date in the window – nothing to push")
+        return 0
+    if changed:
+        print(f"▶︎ {len(changed)} week(s) changed: {', '.join(changed[:10])}{' …' if len(changed) > 10 else ''}")
+    elif args.plan:
+        print("▶︎ Training plan unchanged since the last successful run")
+    else:
+        scope = "every week of the window (--force)" if args.force else "the hot window only"
+        print(f"▶︎ Training plan unchanged – reconciling {scope}")
+
+    # ─── GET SUB CALENDAR INFO ─────────────────────────────
+
+    client = client_from_env(pool_size=max(args.workers, DEFAULT_POOL_SIZE))
+
+    # ─── 1) Fetch subcalendar list once ─────────────────────────────────────
+    # (a plan reuses any cached list, however old, so it needs no API call at all)
+    with METRICS.stage("catalog"):
+        catalog = SubcalendarCatalog.fetch(client, ttl=float("inf") if args.plan else None)
+
+    # TeamUp ids / versions of everything we've pushed before
+    store = EventStateStore.for_calendar(client.calendar_key)
+
+
+    # ─── Build JSON by training group & by venue, coalesced (one pass) ──────
+    projections = build_projections(df, catalog, coalesce=not args.no_coalesce)
+
+    # ─── Overlap pre-check: what TeamUp would reject, before any request ───
+    # (a plain push creates everything again, so it is checked against what we
+    #  already pushed; a sync replaces the synced weeks, so only against itself)
+    known = store.events_between(start_date, end_date) if not args.sync and not args.plan else []
+    projections = check_overlaps(projections, catalog, args.overlaps, known)
+    events = [ev for proj in projections.values() for ev in proj]
+
+    # ─── PLAN (dry run): write the event set once, report, no pushes ────────
+    if args.plan:
+        with METRICS.stage("plan_write"):
+            n = write_plan(args.plan, projections)
+        print(f"▶︎ Plan: wrote {n} events → {args.plan}")
+        summarize_plan(projections)
+        if store.seeded:
+            desired = [ev for ev in events if ev["subcalendar_id"] is not None]
+            managed = {sid for ev in desired for sid in ev["subcalendar_ids"]}
+            diff = diff_events(desired, store.events_between(start_date, end_date, managed))
+            print(
+                f"▶︎ Against the local state store --sync would: {len(diff['creates'])} create, "
+                f"{len(diff['updates'])} update, {len(diff['deletes'])} delete, {diff['unchanged']} unchanged"
+            )
+        store.close()
+        return 0
+
+
+    # ─── PUSH EVENTS TO CALENDAR (journaled, resumable) ─────────────────────
+    apply_ops = make_applier(client, workers=args.workers, rate=args.rate, store=store)
+    journal = PushJournal(batch_size=args.batch_size)
+
+    if not args.sync:
+        ops = [{"op": "create", "event": ev} for ev in events]
+        with METRICS.stage("push"):
+            results = journal.run(ops, apply_ops)
+        failed = sum(r["status"] != "ok" for r in results)
+
+    # ─── SYNC THE EVENTS AGAINST TEAMUP ───────────────────────────────────
+    else:
+        journal.clear_dead_letters()
+
+        # every week overlapping the rolling hot window, plus the weeks whose data changed
+        plan = sync_weeks(
+            client, events, start_date, end_date, changed, apply_ops, store, journal,
+            hot_days=(args.hot_past_days, args.hot_future_days), full=args.force, refresh=args.refresh_state
+        )
+        failed = plan["failed"]
+
+    # ─── Remember what we pushed, so an unchanged report can be skipped ─────
+    if failed:
+        print(f"▶︎ {failed} TeamUp call(s) failed – not updating the report cache")
+    else:
+        report_cache.save()
+
+    store.close()
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    load_env()   # before the parser: the defaults come from the environment
+    parser = add_arguments(argparse.ArgumentParser(description="Push the Smartabase training plan to TeamUp."))
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+def event(title, start="09:00", end="10:00", sids=(1,), day="2025-06-02", **extra):
+    """A built payload / TeamUp event at day start..end (HH:MM, +03:00) in subcalendars sids."""
+    return {"title": title, "start_dt": f"{day}T{start}:00+03:00", "end_dt": f"{day}T{end}:00+03:00",
+            "subcalendar_id": sids[0], "subcalendar_ids": list(sids), "location": "", **extra}
@@ -0,0 +1,22 @@
+from tests.factories import event
+from utils.event_index import EventIndex
+from utils.sync_functions import diff_events
+
+EXISTING = [
+    event("Swim", id=1), event("Gym", id=2), event("Old", day="2025-06-03", id=3),
+    event("Gone", day="2025-06-04", sids=(2, 1), id=4),
+]
+
+
+def test_by_key_diff_matches_grouping_the_list():
+    desired = [event("Gym"), event("New", day="2025-06-03"), event("Extra", day="2025-06-05")]
+    index = EventIndex(EXISTING)
+    assert diff_events(desired, by_key=index.by_key) == diff_events(desired, EXISTING)
+    assert sum(map(len, index.by_key.values())) == len(EXISTING)   # left as it was
+
+
+def test_between_covers_every_subcalendar_of_an_event():
+    index = EventIndex(EXISTING + [event("Duplicate id", day="2025-06-05", id=1)])
+    assert len(index) == 4
+    assert [ev["id"] for ev in index.between("2025-06-02", "2025-06-03", [1])] == [1, 2, 3]
+    assert [ev["id"] for ev in index.between("2025-06-01", "2025-06-30", [2])] == [4]
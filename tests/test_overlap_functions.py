@@ -0,0 +1,40 @@
+from tests.factories import event
+from utils.overlap_functions import IntervalIndex, find_conflicts, drop_conflicts
+
+
+def titles(conflicts):
+    return [(c["event"]["title"], c["other"]["title"]) for c in conflicts]
+
+
+def test_interval_index_uses_the_latest_end_so_far():
+    index = IntervalIndex([(0, 10, "long"), (1, 2, "short"), (20, 30, "late")])
+    assert index.overlaps(5, 6)[-1] == "long"
+    assert index.overlaps(10, 20) is None     # touching ends don't overlap
+    assert index.overlaps(29, 40)[-1] == "late"
+
+
+def test_tie_on_start_keeps_the_earlier_event():
+    a, b = event("A", "09:00", "10:00"), event("B", "09:00", "10:00")
+    assert titles(find_conflicts([a, b], {1})) == [("B", "A")]
+    assert titles(find_conflicts([b, a], {1})) == [("A", "B")]
+
+
+def test_back_to_back_events_dont_conflict():
+    events = [event("A", "09:00", "10:00"), event("B", "10:00", "11:00")]
+    assert find_conflicts(events, {1}) == []
+
+
+def test_rejected_event_doesnt_block_later_ones():
+    # B loses to A; C starts as A ends and only overlaps B, which was rejected
+    events = [event("A", "09:00", "10:00"), event("B", "09:30", "11:00"), event("C", "10:00", "10:30")]
+    assert titles(find_conflicts(events, {1})) == [("B", "A")]
+
+
+def test_only_blocked_subcalendars_and_existing_events():
+    existing = [event("Booked", "09:00", "10:00", sids=(1, 2))]
+    events = [event("New", "09:30", "10:30", sids=(1, 2))]
+    conflicts = find_conflicts(events, {2}, existing=existing)
+    assert [(c["subcalendar_id"], c["other"]["title"]) for c in conflicts] == [(2, "Booked")]
+
+    kept = drop_conflicts(events, conflicts)
+    assert [ev["subcalendar_ids"] for ev in kept] == [[1]]
@@ -0,0 +1,28 @@
+from tests.factories import event
+from utils.payload_functions import coalesce_events
+from utils.teamup_functions import make_version
+
+
+def test_identical_sessions_merge_into_one_multi_subcalendar_event():
+    # two groups training together at one venue, and one group on its own
+    tg  = [event("Swim", sids=(1,)), event("Swim", sids=(2,)), event("Gym", sids=(1,), start="11:00", end="12:00")]
+    ven = [event("Swim", sids=(9,)), event("Swim", sids=(9,)), event("Gym", sids=(8,), start="11:00", end="12:00")]
+    swim, gym = coalesce_events(tg, ven)
+
+    assert swim["subcalendar_ids"] == [1, 9, 2]   # training group first, no repeats
+    assert swim["subcalendar_id"] == 1
+    assert swim["version"] == make_version(1, swim["start_dt"], swim["end_dt"])
+    assert gym["subcalendar_ids"] == [1, 8]
+
+
+def test_different_title_location_or_time_stay_apart():
+    tg = [event("Swim"), event("Swim", location="Pool B"), event("Swim", end="10:30"), event("Gym")]
+    assert len(coalesce_events(tg, tg)) == 4
+
+
+def test_rows_without_subcalendars():
+    tg, ven = [event("Swim", sids=(None,))], [event("Swim", sids=(9,))]
+    tg[0]["subcalendar_ids"] = []
+    (ev,) = coalesce_events(tg, ven)
+    assert ev["subcalendar_ids"] == [9] and ev["subcalendar_id"] == 9
+    assert coalesce_events([], []) == []
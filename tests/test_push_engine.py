@@ -0,0 +1,16 @@
+from utils.push_engine import TokenBucket
+
+
+def test_one_burst_of_429s_halves_the_rate_once():
+    bucket = TokenBucket(rate=10)
+    for _ in range(8):   # every in-flight worker gets the same 429
+        bucket.throttle(retry_after=0.5)
+    assert bucket.rate == 5
+    assert bucket.throttles == 1
+
+
+def test_rate_recovers_in_proportion():
+    bucket = TokenBucket(rate=5, max_rate=10)
+    for _ in range(15):
+        bucket.reward()
+    assert bucket.rate == 10
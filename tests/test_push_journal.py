@@ -0,0 +1,84 @@
+import json
+
+from utils.push_journal import PushJournal, batch_bounds, ops_fingerprint
+
+
+def ops(*kinds):
+    return [{"op": kind, "event": {"n": n}} for n, kind in enumerate(kinds)]
+
+
+def applier(calls, fail=()):
+    def apply(batch):
+        calls.append([op["event"]["n"] for op in batch])
+        return [{**op, "status": "failed" if op["event"]["n"] in fail else "ok", "error": None}
+                for op in batch]
+    return apply
+
+
+def journal(tmp_path, batch_size=2):
+    return PushJournal(path=str(tmp_path / "journal.json"),
+                       dead_letter_path=str(tmp_path / "dead.ndjson"), batch_size=batch_size)
+
+
+def test_batch_bounds_never_mix_deletes():
+    run = ops("delete", "delete", "delete", "update", "create", "create")
+    assert list(batch_bounds(run, 0, 2)) == [(0, 2), (2, 3), (3, 5), (5, 6)]
+    assert list(batch_bounds(run, 1, 10)) == [(1, 3), (3, 6)]
+
+
+def test_deletes_finish_before_the_rest_starts(tmp_path):
+    calls = []
+    journal(tmp_path, batch_size=50).run(ops("delete", "delete", "update", "create"), applier(calls))
+    assert calls == [[0, 1], [2, 3]]
+
+
+def test_resumes_at_the_committed_offset(tmp_path):
+    run = ops("create", "create", "create", "create", "create")
+    j = journal(tmp_path)
+    (tmp_path / "journal.json").write_text(json.dumps({"run_id": ops_fingerprint(run), "committed": 2}))
+
+    calls = []
+    results = j.run(run, applier(calls))
+    assert calls == [[2, 3], [4]]
+    assert len(results) == 3
+    assert not (tmp_path / "journal.json").exists()   # finished – nothing left to resume
+
+
+def test_other_ops_start_from_the_beginning(tmp_path):
+    j = journal(tmp_path)
+    (tmp_path / "journal.json").write_text(json.dumps({"run_id": "something else", "committed": 2}))
+
+    calls = []
+    j.run(ops("create", "create", "create"), applier(calls))
+    assert calls == [[0, 1], [2]]
+
+
+def test_checkpoint_after_each_batch(tmp_path):
+    run = ops("create", "create", "create")
+    j = journal(tmp_path)
+
+    def crash_on_second(batch):
+        if batch[0]["event"]["n"] == 2:
+            raise KeyboardInterrupt
+        return applier([])(batch)
+
+    try:
+        j.run(run, crash_on_second)
+    except KeyboardInterrupt:
+        pass
+    assert json.loads((tmp_path / "journal.json").read_text())["committed"] == 2
+
+    calls = []
+    j.run(run, applier(calls))
+    assert calls == [[2]]
+
+
+def test_failures_are_dead_lettered_and_redriven(tmp_path):
+    j = journal(tmp_path)
+    j.run(ops("create", "create", "create"), applier([], fail={0, 2}))
+    assert [letter["event"]["n"] for letter in j.dead_letters()] == [0, 2]
+
+    calls = []
+    j.redrive(applier(calls))
+    assert calls == [[0, 2]]
+    assert j.dead_letters() == []
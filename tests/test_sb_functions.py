@@ -0,0 +1,71 @@
+import io
+import re
+from datetime import date
+from functools import lru_cache
+
+import pandas as pd
+
+from benchmarks.synthetic_report import synthetic_report
+from utils.pipeline_config import VENUE_LIST, GROUPS_TO_REMOVE
+from utils.sb_functions import (
+    convert_to_time, add_iso_columns, read_training_plan, stream_training_plan, clean_training_plan
+)
+from utils.teamup_functions import parse_iso
+
+START, END = date(2025, 5, 11), date(2025, 12, 31)
+
+
+@lru_cache(maxsize=None)
+def report(n=3000):
+    return synthetic_report(n)
+
+
+def cleaned(html):
+    return clean_training_plan(read_training_plan(html), START, END, GROUPS_TO_REMOVE, VENUE_LIST)
+
+
+def test_iso_columns_match_the_per_row_conversion():
+    df = cleaned(report().decode())
+    out = add_iso_columns(df, offset_hours=12, tz_offset="+03:00")
+
+    start = pd.to_numeric(df["Start_Time"], errors="coerce").apply(convert_to_time)
+    end   = pd.to_numeric(df["Finish_Time"], errors="coerce").apply(convert_to_time)
+    expected = [
+        (parse_iso(str(day), s), parse_iso(str(day), e))
+        for day, s, e in zip(df["Date"], start, end) if s is not None and e is not None
+    ]
+    assert len(out) == len(expected) > 0
+    assert list(zip(out["Start_ISO"], out["End_ISO"])) == expected
+
+
+def test_iso_columns_edge_times_and_bad_rows():
+    df = pd.DataFrame({
+        "Date":        [date(2025, 6, 1), date(2025, 6, 1), date(2025, 6, 1), None],
+        # (12:00 UTC is local midnight with the 12 h offset) midnight; an unconvertible
+        # finish (dropped); a minute and a second past midnight (truncated); no date (dropped)
+        "Start_Time":  [43200000, 43200000, 43261000, 0],
+        "Finish_Time": [46800000, "n/a", 46800000, 0],
+    })
+    out = add_iso_columns(df)
+    assert list(out["Start_ISO"]) == ["2025-06-01T00:00:00+03:00", "2025-06-01T00:01:00+03:00"]
+    assert list(out["End_ISO"]) == ["2025-06-01T01:00:00+03:00", "2025-06-01T01:00:00+03:00"]
+    assert [convert_to_time(v) for v in (43200000, 43261000)] == ["00:00", "00:01"]
+
+
+def streamed(data):
+    frame = stream_training_plan(io.BytesIO(data), START, END, GROUPS_TO_REMOVE)
+    return clean_training_plan(frame, START, END, GROUPS_TO_REMOVE, VENUE_LIST)
+
+
+def test_streamed_parse_matches_read_html():
+    expected = cleaned(report().decode()).reset_index(drop=True)
+    got = streamed(report()).reset_index(drop=True)
+    assert len(got) > 0 and set(got.columns) == set(expected.columns)
+    pd.testing.assert_frame_equal(got[list(expected.columns)], expected, check_dtype=False)
+
+
+def test_report_without_rows_gives_an_empty_table():
+    empty = re.sub(rb"<tr>\s*<td>.*?</tr>", b"", report(), flags=re.S)
+    got, expected = streamed(empty), cleaned(empty.decode())
+    assert got.empty and expected.empty
+    assert list(got.columns) == list(expected.columns)
@@ -0,0 +1,42 @@
+from tests.factories import event
+from utils.sync_functions import diff_events, event_key, plan_ops
+
+
+def test_event_key_ignores_timestamp_format():
+    utc = event("b", start_dt="2025-06-02T06:00:00Z", end_dt="2025-06-02T07:00:00Z")
+    assert event_key(event("a")) == event_key(utc)
+    assert event_key(event("a")) != event_key(event("a", sids=(2,)))
+
+
+def test_duplicate_keys_pair_exact_content_first():
+    existing = [event("Swim", id=1), event("Gym", id=2)]
+    desired  = [event("Gym"), event("Swim")]
+    plan = diff_events(desired, existing)
+    assert plan == {"creates": [], "updates": [], "deletes": [], "unchanged": 2}
+
+
+def test_duplicate_keys_reuse_leftovers_for_updates():
+    existing = [event("Swim", id=1), event("Old", id=2)]
+    desired  = [event("New"), event("Swim")]
+    plan = diff_events(desired, existing)
+    assert plan["unchanged"] == 1
+    assert [(old["id"], new["title"]) for old, new in plan["updates"]] == [(2, "New")]
+    assert plan["creates"] == [] and plan["deletes"] == []
+
+
+def test_duplicate_keys_surplus_and_shortfall():
+    # three wanted, one there → two creates; and the reverse → two deletes
+    plan = diff_events([event("A"), event("B"), event("C")], [event("B", id=1)])
+    assert plan["unchanged"] == 1
+    assert sorted(ev["title"] for ev in plan["creates"]) == ["A", "C"]
+
+    plan = diff_events([event("B")], [event("A", id=1), event("B", id=2), event("C", id=3)])
+    assert plan["unchanged"] == 1
+    assert sorted(ev["id"] for ev in plan["deletes"]) == [1, 3]
+    assert plan["updates"] == [] and plan["creates"] == []
+
+
+def test_plan_ops_puts_deletes_first():
+    plan = diff_events([event("New", sids=(2,)), event("Changed")],
+                       [event("Was", id=1), event("Gone", id=2, sids=(3,))])
+    assert [op["op"] for op in plan_ops(plan)] == ["delete", "update", "create"]
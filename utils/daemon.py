@@ -0,0 +1,137 @@
+# ─── POLLING DAEMON ─────────────────────────────────────────────────────────
+import signal
+import threading
+import time
+
+from utils.pipeline import (
+    fetch_training_plan,
+    prepare_table,
+    changed_weeks,
+    build_projections,
+    check_overlaps,
+    sync_weeks
+)
+from utils.subcalendar_catalog import SubcalendarCatalog
+from utils.resilience import CircuitBreaker
+from utils.instrumentation import METRICS
+from utils.pipeline_config import DAEMON_INTERVAL, DAEMON_HOT_EVERY, DAEMON_CATALOG_TTL
+
+
+class PollingDaemon:
+    """
+    Polls the Smartabase report and pushes only what changed, keeping the
+    TeamUp session, subcalendar catalog and last parsed table in memory.
+
+    A cycle costs one conditional GET when nothing changed; otherwise only
+    the changed weeks are diffed against the state store and pushed. The
+    hot window is re-listed from TeamUp every hot_every seconds (from the
+    warm table when the report itself is unchanged). Memory stays flat:
+    one table, the catalog, and metrics reset after every cycle.
+
+    opts: start, end, groups_to_remove, venue_list, stream, coalesce,
+          overlaps, hot_days (past, future)
+    """
+
+    def __init__(self, client, session, url, report_cache, store, journal, apply_ops, opts,
+                 interval=DAEMON_INTERVAL, hot_every=DAEMON_HOT_EVERY,
+                 catalog_ttl=DAEMON_CATALOG_TTL, report_path=None):
+        self.client       = client
+        self.session      = session
+        self.url          = url
+        self.report_cache = report_cache
+        self.store        = store
+        self.journal      = journal
+        self.apply_ops    = apply_ops
+        self.opts         = opts
+        self.interval     = interval
+        self.hot_every    = hot_every
+        self.catalog_ttl  = catalog_ttl
+        self.report_path  = report_path
+
+        self.sb_breaker = CircuitBreaker("smartabase")
+        self.stop_event = threading.Event()
+        self.catalog    = None
+        self.df         = None     # last parsed table
+        self.last_hot   = None     # monotonic time of the last successful hot reconcile
+        self.cycles     = 0
+
+    # ─── Shutdown ───────────────────────────────────────────────────────────
+    def install_signal_handlers(self):
+        """SIGINT / SIGTERM finish the current cycle and stop; a second one stops at once."""
+        def handler(signum, frame):
+            if self.stop_event.is_set():
+                raise KeyboardInterrupt
+            print(f"▶︎ {signal.Signals(signum).name} received – stopping after this cycle")
+            self.stop_event.set()
+
+        signal.signal(signal.SIGINT, handler)
+        signal.signal(signal.SIGTERM, handler)
+
+    def stop(self):
+        self.stop_event.set()
+
+    # ─── Loop ───────────────────────────────────────────────────────────────
+    def run(self, max_cycles=None):
+        print(f"▶︎ Daemon polling {self.url.split('?')[0]} every {self.interval:.0f}s")
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            try:
+                status = self.cycle()
+            except Exception as err:   # keep polling; the next cycle retries
+                status = f"failed: {err}"
+            self.cycles += 1
+            print(f"▶︎ Cycle {self.cycles}: {status} ({time.monotonic() - started:.1f}s)", flush=True)
+
+            if self.report_path:
+                METRICS.write_report(self.report_path)
+            METRICS.reset()
+            if max_cycles and self.cycles >= max_cycles:
+                break
+            self.stop_event.wait(self.interval)
+        print("▶︎ Daemon stopped")
+
+    def _catalog(self):
+        if self.catalog is None or time.time() - self.catalog.fetched_at > self.catalog_ttl:
+            with METRICS.stage("catalog"):
+                self.catalog = SubcalendarCatalog.fetch(self.client, ttl=0)
+        return self.catalog
+
+    def cycle(self):
+        """One poll; returns a short status line."""
+        o = self.opts
+        hot_due = self.last_hot is None or time.monotonic() - self.last_hot >= self.hot_every
+
+        # without a warm table a due hot reconcile needs the report even if unchanged
+        conditional = {} if hot_due and self.df is None else self.report_cache.conditional_headers(self.url)
+        data = fetch_training_plan(self.session, self.url, o["start"], o["end"], o["groups_to_remove"],
+                                   self.report_cache, conditional, stream=o["stream"], breaker=self.sb_breaker)
+        if data is None:
+            changed = []
+            if not hot_due:
+                return "not modified"
+        else:
+            self.df = prepare_table(data, o["start"], o["end"], o["groups_to_remove"], o["venue_list"])
+            del data   # only the cleaned table stays in memory
+            changed = changed_weeks(self.df, self.report_cache)
+            if not changed and not hot_due:
+                self.report_cache.save()   # new validators, same content
+                return "no changes"
+
+        projections = build_projections(self.df, self._catalog(), coalesce=o["coalesce"])
+        projections = check_overlaps(projections, self.catalog, o["overlaps"])
+        events = [ev for proj in projections.values() for ev in proj]
+
+        self.journal.clear_dead_letters()
+        plan = sync_weeks(
+            self.client, events, o["start"], o["end"], changed, self.apply_ops, self.store, self.journal,
+            hot_days=o["hot_days"] if hot_due else (0, 0)
+        )
+        if plan["failed"]:
+            # the fingerprints aren't saved, so the next cycle retries these weeks
+            return f"{plan['failed']} TeamUp call(s) failed"
+
+        self.report_cache.save()
+        if hot_due:
+            self.last_hot = time.monotonic()
+        return (f"{len(changed)} week(s) changed, {len(plan['creates'])} created, "
+                f"{len(plan['updates'])} updated, {len(plan['deletes'])} deleted")
@@ -0,0 +1,57 @@
+# ─── EXISTING EVENT INDEX ───────────────────────────────────────────────────
+from bisect import bisect_left, bisect_right, insort
+
+from utils.teamup_functions import fetch_events, normalize_iso, event_key
+
+
+class EventIndex:
+    """
+    TeamUp events held in memory, keyed by event_key (primary subcalendar,
+    start and end, hashed as make_version does) for diff_events, and per
+    subcalendar in start order for window queries. A multi-subcalendar event
+    is indexed under each of its subcalendars.
+    """
+
+    def __init__(self, events=()):
+        self.by_id     = {}
+        self.by_key    = {}   # event_key → [events]
+        self.by_subcal = {}   # subcalendar_id → sorted [(start_dt, id)]
+        for ev in events:
+            self.add(ev)
+
+    @classmethod
+    def load(cls, client, start_date, end_date, subcalendar_ids=None, workers=8):
+        """
+        Index of the events fetch_events returns for the window that start in
+        it (TeamUp also lists events that only overlap its first day).
+        """
+        lo, hi = str(start_date)[:10], str(end_date)[:10]
+        events = fetch_events(client, start_date, end_date, subcalendar_ids, workers)
+        return cls(ev for ev in events if lo <= normalize_iso(ev["start_dt"])[:10] <= hi)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def add(self, ev):
+        """Insert an event (an id already indexed is kept as it is)."""
+        ev_id = str(ev["id"])
+        if ev_id in self.by_id:
+            return
+        self.by_id[ev_id] = ev
+        self.by_key.setdefault(event_key(ev), []).append(ev)
+        start = normalize_iso(ev["start_dt"])
+        for sid in ev.get("subcalendar_ids") or []:
+            insort(self.by_subcal.setdefault(sid, []), (start, ev_id))
+
+    def between(self, start_date, end_date, subcalendar_ids=None):
+        """Events starting on start_date..end_date (dates), in start order."""
+        lo, hi = str(start_date)[:10], str(end_date)[:10] + "\uffff"   # hi sorts after any time that day
+        found = {}
+        for sid in (self.by_subcal if subcalendar_ids is None else subcalendar_ids):
+            starts = self.by_subcal.get(sid, [])
+            for _, ev_id in starts[bisect_left(starts, (lo,)):bisect_right(starts, (hi,))]:
+                found[ev_id] = self.by_id[ev_id]
+        return sorted(found.values(), key=lambda ev: normalize_iso(ev["start_dt"]))
@@ -0,0 +1,169 @@
+# ─── INSTRUMENTATION ────────────────────────────────────────────────────────
+import contextlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    k = math.ceil(p / 100.0 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, k))]
+
+
+def route_of(method, url):
+    """'GET https://api.teamup.com/abc/events/123?x=1' → 'GET /abc/events/{id}'"""
+    path = re.sub(r"/\d+(?=/|$)", "/{id}", urlparse(url).path)
+    return f"{method} {path}"
+
+
+class Instrumentation:
+    """
+    Collects stage wall times, every HTTP call (service, route, status,
+    latency) and per-service counters (retries, breaker trips, …) for one
+    run, and turns them into a JSON run report.
+    """
+
+    def __init__(self):
+        self.started  = time.time()
+        self.stages   = {}
+        self.requests = []   # (service, route, status, latency_s)
+        self.counters = {}   # service → {name → value}
+        self._lock    = threading.Lock()
+
+    def reset(self):
+        """Start a fresh report (the daemon does this after every cycle)."""
+        with self._lock:
+            self.started  = time.time()
+            self.stages   = {}
+            self.requests = []
+            self.counters = {}
+
+    # ─── Stages ─────────────────────────────────────────────────────────────
+    @contextlib.contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    # ─── HTTP ───────────────────────────────────────────────────────────────
+    def record_request(self, service, route, status, latency):
+        with self._lock:
+            self.requests.append((service, route, status, latency))
+
+    def instrument_session(self, session, service):
+        """Record every response of a requests.Session (latency = time to headers)."""
+        def hook(resp, *args, **kwargs):
+            self.record_request(
+                service, route_of(resp.request.method, resp.request.url),
+                resp.status_code, resp.elapsed.total_seconds()
+            )
+        session.hooks.setdefault("response", []).append(hook)
+        return session
+
+    def record_body(self, service, nbytes, seconds):
+        """Count a response body read after the headers (resp.elapsed stops at the headers)."""
+        self.incr(service, "body_bytes", nbytes)
+        self.incr(service, "body_read_s", seconds)
+
+    # ─── Counters ───────────────────────────────────────────────────────────
+    def incr(self, service, name, amount=1):
+        with self._lock:
+            counters = self.counters.setdefault(service, {})
+            counters[name] = counters.get(name, 0) + amount
+
+    # ─── Report ─────────────────────────────────────────────────────────────
+    @staticmethod
+    def _summary(calls):
+        latencies = sorted(c[3] * 1000.0 for c in calls)
+        statuses = {}
+        for c in calls:
+            statuses[str(c[2])] = statuses.get(str(c[2]), 0) + 1
+        buckets = {}
+        for bound in LATENCY_BUCKETS_MS + [float("inf")]:
+            label = f"<={bound}ms" if bound != float("inf") else f">{LATENCY_BUCKETS_MS[-1]}ms"
+            buckets[label] = sum(1 for v in latencies if v <= bound) - sum(buckets.values())
+        return {
+            "requests": len(calls),
+            "status":   statuses,
+            "latency_ms": {
+                "p50":  round(percentile(latencies, 50), 1),
+                "p95":  round(percentile(latencies, 95), 1),
+                "p99":  round(percentile(latencies, 99), 1),
+                "max":  round(latencies[-1], 1) if latencies else 0.0,
+                "mean": round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+            },
+            "histogram": buckets,
+        }
+
+    def report(self):
+        with self._lock:
+            requests = list(self.requests)
+            stages = dict(self.stages)
+            counters = {
+                service: {k: round(v, 3) if isinstance(v, float) else v for k, v in c.items()}
+                for service, c in self.counters.items()
+            }
+
+        http = {}
+        for service in sorted({r[0] for r in requests}):
+            calls = [r for r in requests if r[0] == service]
+            summary = self._summary(calls)
+            summary["routes"] = {
+                route: self._summary([c for c in calls if c[1] == route])
+                for route in sorted({c[1] for c in calls})
+            }
+            http[service] = summary
+
+        return {
+            "started_at":  datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "wall_time_s": round(time.time() - self.started, 3),
+            "stages_s":    {k: round(v, 4) for k, v in stages.items()},
+            "http":        http,
+            "resilience":  counters,
+        }
+
+    def write_report(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"▶︎ Run report → {path}")
+
+
+class CountingReader:
+    """
+    File-like wrapper for a streamed response body: counts the bytes read
+    and the time spent waiting in read(), so a parse that consumes the body
+    as it downloads still shows how much of its time was the download.
+    """
+
+    def __init__(self, raw):
+        self.raw     = raw
+        self.nbytes  = 0
+        self.seconds = 0.0
+
+    def read(self, *args):
+        started = time.perf_counter()
+        chunk = self.raw.read(*args)
+        self.seconds += time.perf_counter() - started
+        self.nbytes += len(chunk)
+        return chunk
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+
+# one collector per process; the scripts and the TeamUp client share it
+METRICS = Instrumentation()
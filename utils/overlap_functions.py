@@ -0,0 +1,103 @@
+# ─── OVERLAP PRE-VALIDATION ─────────────────────────────────────────────────
+from bisect import bisect_left
+from itertools import accumulate
+
+from utils.teamup_functions import normalize_iso, make_version
+
+
+def no_overlap_subcalendars(catalog):
+    """Ids of the subcalendars that don't allow overlapping events ("Allow Overlap" = 0)."""
+    return {sc["id"] for sc in catalog if sc.get("overlap") is False}
+
+
+class IntervalIndex:
+    """
+    Intervals already booked in one subcalendar (e.g. events known to be in
+    TeamUp), sorted by start with a running max of the end times, so one
+    overlap query is a binary search.
+    """
+
+    def __init__(self, intervals):
+        self.items  = sorted(intervals, key=lambda iv: (iv[0], iv[1]))
+        self.starts = [iv[0] for iv in self.items]
+        # index of the latest-ending interval among items[:i + 1]
+        self.latest = list(accumulate(
+            range(len(self.items)), lambda best, i: i if self.items[i][1] > self.items[best][1] else best
+        ))
+
+    def overlaps(self, start, end):
+        """A booked interval overlapping [start, end) (the latest-ending one), else None."""
+        i = bisect_left(self.starts, end)   # everything before i starts before `end`
+        if i and self.items[self.latest[i - 1]][1] > start:
+            return self.items[self.latest[i - 1]]
+        return None
+
+
+def find_conflicts(events, blocked_ids, existing=()):
+    """
+    Events TeamUp would reject because they overlap another event in a
+    subcalendar that doesn't allow it. Per subcalendar, new events are
+    checked against the `existing` ones (an IntervalIndex) and then swept
+    in start order against each other; on a tie the earlier event wins.
+    O(n log n) overall.
+
+    Returns [{"event", "subcalendar_id", "other"}]; other is the event it clashes with.
+    """
+    blocked_ids = set(blocked_ids)
+    booked, wanted = {}, {}
+    for ev in existing:
+        for sid in set(ev.get("subcalendar_ids") or []) & blocked_ids:
+            booked.setdefault(sid, []).append((normalize_iso(ev["start_dt"]), normalize_iso(ev["end_dt"]), ev))
+    for n, ev in enumerate(events):
+        for sid in set(ev.get("subcalendar_ids") or []) & blocked_ids:
+            wanted.setdefault(sid, []).append((ev["start_dt"], ev["end_dt"], n, ev))
+
+    conflicts = []
+    for sid, intervals in wanted.items():
+        index = IntervalIndex(booked.get(sid, []))
+        holder = None   # kept event with the latest end so far
+        for start, end, _, ev in sorted(intervals, key=lambda iv: (iv[0], iv[2])):
+            clash = index.overlaps(start, end)
+            if clash is None and holder is not None and start < holder[1]:
+                clash = holder
+            if clash is not None:
+                conflicts.append({"event": ev, "subcalendar_id": sid, "other": clash[-1]})
+            elif holder is None or end > holder[1]:
+                holder = (start, end, ev)
+    return conflicts
+
+
+def drop_conflicts(events, conflicts):
+    """
+    Take each conflicting subcalendar off its event; events left without
+    any subcalendar are dropped. Returns the events to push.
+    """
+    blocked = {}
+    for c in conflicts:
+        blocked.setdefault(id(c["event"]), set()).add(c["subcalendar_id"])
+
+    out = []
+    for ev in events:
+        if id(ev) not in blocked:
+            out.append(ev)
+            continue
+        subs = [sid for sid in ev["subcalendar_ids"] if sid not in blocked[id(ev)]]
+        if subs:
+            out.append({**ev, "subcalendar_ids": subs, "subcalendar_id": subs[0],
+                        "version": make_version(subs[0], ev["start_dt"], ev["end_dt"])})
+    return out
+
+
+def report_conflicts(conflicts, catalog, limit=20):
+    """Print the conflicts, one per line, with subcalendar names."""
+    if not conflicts:
+        print("▶︎ Overlap check: no conflicts")
+        return
+    subcals = {c["subcalendar_id"] for c in conflicts}
+    print(f"▶︎ Overlap check: {len(conflicts)} conflict(s) in {len(subcals)} no-overlap subcalendar(s)")
+    for c in conflicts[:limit]:
+        ev, other = c["event"], c["other"]
+        name = (catalog.by_id.get(c["subcalendar_id"]) or {}).get("name", c["subcalendar_id"])
+        print(f"  ✗ {name}: {ev.get('title')} @ {ev['start_dt']} overlaps {other.get('title')} @ {other['start_dt']}")
+    if len(conflicts) > limit:
+        print(f"  … and {len(conflicts) - limit} more")
@@ -0,0 +1,56 @@
+# ─── DATE PARTITION FUNCTIONS ───────────────────────────────────────────────
+from datetime import date, timedelta
+
+import pandas as pd
+
+
+def week_start(day):
+    """Monday of the week `day` falls in."""
+    return day - timedelta(days=day.weekday())
+
+
+def week_label(day):
+    """Partition label of a date (or 'YYYY-mm-dd…' string): its Monday, '2025-05-12'."""
+    if isinstance(day, str):
+        day = date.fromisoformat(day[:10])
+    return week_start(day).isoformat()
+
+
+def week_labels(dates):
+    """week_label for a whole Series of dates at once."""
+    d = pd.to_datetime(pd.Series(dates))
+    return (d - pd.to_timedelta(d.dt.weekday, unit="D")).dt.strftime("%Y-%m-%d")
+
+
+def week_partitions(start_date, end_date, hot=None):
+    """
+    The window cut into weeks, clipped to [start_date, end_date]:
+    [{"label", "start", "end", "hot"}]. hot = (start, end) of the rolling
+    window; partitions overlapping it are flagged.
+    """
+    out = []
+    monday = week_start(start_date)
+    while monday <= end_date:
+        lo, hi = max(monday, start_date), min(monday + timedelta(days=6), end_date)
+        out.append({
+            "label": monday.isoformat(),
+            "start": lo,
+            "end":   hi,
+            "hot":   hot is not None and lo <= hot[1] and hi >= hot[0],
+        })
+        monday += timedelta(days=7)
+    return out
+
+
+def hot_window(past_days, future_days, today=None):
+    """(today − past_days, today + future_days); None when both are 0."""
+    if not past_days and not future_days:
+        return None
+    today = today or date.today()
+    return today - timedelta(days=past_days), today + timedelta(days=future_days)
+
+
+def select_partitions(partitions, changed):
+    """The partitions to sync: every hot one plus those whose fingerprint changed."""
+    changed = set(changed)
+    return [p for p in partitions if p["hot"] or p["label"] in changed]
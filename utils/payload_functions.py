@@ -0,0 +1,116 @@
+# ─── EVENT PAYLOAD FUNCTIONS ────────────────────────────────────────────────
+import json
+
+from utils.teamup_functions import make_versions
+
+TZ_NAME = "Asia/Riyadh"
+
+
+def _projection(titles, subs, locations, starts, ends, tz_name):
+    subs    = [list(s) if isinstance(s, list) else [] for s in subs]
+    primary = [s[0] if s else None for s in subs]
+    versions = make_versions(primary, starts, ends)
+    return [
+        {
+            "subcalendar_id":  subcal_id,
+            "subcalendar_ids": ids,
+            "start_dt":        start_iso,
+            "end_dt":          end_iso,
+            "all_day":         False,
+            "title":           title,
+            "location":        location,
+            "version":         version,
+            "readonly":        False,
+            "tz":              tz_name,
+            "attachments":     []
+        }
+        for title, ids, subcal_id, location, start_iso, end_iso, version
+        in zip(titles, subs, primary, locations, starts, ends, versions)
+    ]
+
+
+def build_event_payloads(df, tg_lookup, venue_lookup, tz_name=TZ_NAME):
+    """
+    Build the training-group and venue projections of the cleaned
+    Smartabase frame in one column-wise pass.
+
+    df needs Training_Group, Session_Type, Venue, Start_ISO and End_ISO;
+    the lookups map a training group / venue name to its subcalendar ids.
+    Returns (tg_out, ven_out), one payload per row each.
+    """
+    tg      = df["Training_Group"].astype(str)
+    session = df["Session_Type"].fillna("").astype(str)
+    venue   = df["Venue"].fillna("").astype(str)
+    starts  = df["Start_ISO"].tolist()
+    ends    = df["End_ISO"].tolist()
+
+    # titles exactly like the samples: "Session – Group" / "Group - Session"
+    has_session = session != ""
+    tg_titles   = (session + " – " + tg).where(has_session, tg)
+    ven_titles  = (tg + " - " + session).where(has_session, tg)
+
+    locations = venue.tolist()
+    tg_out = _projection(tg_titles.tolist(), tg.map(tg_lookup).tolist(),
+                         locations, starts, ends, tz_name)
+    ven_out = _projection(ven_titles.tolist(), venue.map(venue_lookup).tolist(),
+                          locations, starts, ends, tz_name)
+    return tg_out, ven_out
+
+
+def coalesce_events(*projections):
+    """
+    Merge row-aligned projections (e.g. tg_out, ven_out) into one event per
+    (start, end, title, location), carrying every subcalendar id involved:
+    the row's training group and venue, and all rows that repeat the same
+    session. Titles and locations come from the first projection.
+    """
+    merged = {}
+    for row in zip(*projections):
+        base = row[0]
+        key = (base["start_dt"], base["end_dt"], base["title"], base["location"])
+        ev = merged.get(key)
+        if ev is None:
+            ev = merged[key] = {**base, "subcalendar_ids": []}
+        for proj in row:
+            for sid in proj["subcalendar_ids"]:
+                if sid not in ev["subcalendar_ids"]:
+                    ev["subcalendar_ids"].append(sid)
+
+    events = list(merged.values())
+    primary = [ev["subcalendar_ids"][0] if ev["subcalendar_ids"] else None for ev in events]
+    versions = make_versions(primary, [ev["start_dt"] for ev in events], [ev["end_dt"] for ev in events])
+    for ev, subcal_id, version in zip(events, primary, versions):
+        ev["subcalendar_id"] = subcal_id
+        ev["version"] = version
+    return events
+
+
+def write_plan(path, projections):
+    """
+    Write {projection name → payloads} once, as NDJSON (one event per line,
+    tagged with its projection) or, for a *.parquet path, as a Parquet table.
+    Returns the number of events written.
+    """
+    if str(path).endswith(".parquet"):
+        import pandas as pd  # to_parquet needs pyarrow or fastparquet installed
+
+        rows = [{"projection": name, **ev} for name, events in projections.items() for ev in events]
+        pd.DataFrame(rows).to_parquet(path, index=False)
+        return len(rows)
+
+    n = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for name, events in projections.items():
+            for ev in events:
+                f.write(json.dumps({"projection": name, **ev}, ensure_ascii=False))
+                f.write("\n")
+                n += 1
+    return n
+
+
+def summarize_plan(projections):
+    """Print per-projection counts, including events no subcalendar matched."""
+    for name, events in projections.items():
+        unmatched = sum(ev["subcalendar_id"] is None for ev in events)
+        subcals = len({ev["subcalendar_id"] for ev in events if ev["subcalendar_id"] is not None})
+        print(f"  {name:<15} {len(events):>6} events across {subcals} subcalendar(s), {unmatched} without a subcalendar")
@@ -0,0 +1,124 @@
+# ─── PIPELINE STEPS ─────────────────────────────────────────────────────────
+# The Smartabase → TeamUp steps shared by the one-shot run and the daemon.
+import time
+
+from utils.sb_functions import stream_training_plan, read_training_plan, clean_training_plan, add_iso_columns
+from utils.payload_functions import build_event_payloads, coalesce_events
+from utils.overlap_functions import no_overlap_subcalendars, find_conflicts, drop_conflicts, report_conflicts
+from utils.partition_functions import week_labels, week_partitions, hot_window, select_partitions
+from utils.sb_cache import partition_fingerprints
+from utils.sync_functions import sync_partitions
+from utils.instrumentation import METRICS, CountingReader, route_of
+from utils.resilience import send_with_retries
+
+
+def fetch_training_plan(session, url, start_date, end_date, groups_to_remove, report_cache,
+                        conditional=None, stream=True, breaker=None):
+    """
+    Download (and, with stream, parse while downloading) the training plan
+    report. Returns the rows, or None when Smartabase answered 304 to the
+    conditional headers. The response validators go to report_cache.
+
+    Stages: smartabase_fetch (headers, and the whole body without stream),
+    parse (pd.read_html) or smartabase_fetch_parse (streamed body + parse,
+    with the body's bytes / read time in the "smartabase" counters).
+    """
+    # (timeouts / 5xx are retried with backoff; a failing Smartabase trips its breaker)
+    # (always streamed, so the body download is timed here rather than inside get())
+    fetch = lambda: session.get(url, headers=conditional or {}, stream=True, timeout=(10, 120))
+    with METRICS.stage("smartabase_fetch"):
+        response = send_with_retries(fetch, "GET", "smartabase", route_of("GET", url), breaker=breaker)
+    with response:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        report_cache.remember_response(url, response)
+
+        if not stream:
+            # whole download, then read the first HTML table
+            with METRICS.stage("smartabase_fetch"):
+                started = time.perf_counter()
+                html = response.text
+                METRICS.record_body("smartabase", len(response.content), time.perf_counter() - started)
+            with METRICS.stage("parse"):
+                return read_training_plan(html)
+
+        # parse the table as it downloads, dropping rows outside the window early
+        with METRICS.stage("smartabase_fetch_parse"):
+            response.raw.decode_content = True
+            body = CountingReader(response.raw)
+            try:
+                return stream_training_plan(body, start_date, end_date, groups_to_remove)
+            finally:
+                METRICS.record_body("smartabase", body.nbytes, body.seconds)
+
+
+def prepare_table(data, start_date, end_date, groups_to_remove, venue_list):
+    """Clean the raw rows and add the Start_ISO / End_ISO columns."""
+    with METRICS.stage("clean"):
+        df = clean_training_plan(data, start_date, end_date, groups_to_remove, venue_list)
+
+    # Convert times (ms epoch, 12h offset) straight to ISO start/end columns
+    with METRICS.stage("time_conversion"):
+        return add_iso_columns(df, offset_hours=12, tz_offset="+03:00")
+
+
+def changed_weeks(df, report_cache):
+    """Week labels whose fingerprint differs from the last saved run."""
+    with METRICS.stage("change_check"):
+        return report_cache.changed_partitions(partition_fingerprints(df, week_labels(df["Date"])))
+
+
+def build_projections(df, catalog, coalesce=True):
+    """{projection name → payloads}: coalesced, or the training-group and venue projections."""
+    with METRICS.stage("payload_build"):
+        tg_out, ven_out = build_event_payloads(
+            df,
+            tg_lookup=catalog.lookup("Sport"),
+            venue_lookup=catalog.lookup("Venue")
+        )
+    print(f"Converted {len(df)} rows → {len(tg_out)} training-group + {len(ven_out)} venue events")
+
+    # one event per session, in its group's and venue's subcalendars
+    if not coalesce:
+        return {"training_group": tg_out, "venue": ven_out}
+    with METRICS.stage("coalesce"):
+        projections = {"coalesced": coalesce_events(tg_out, ven_out)}
+    print(f"▶︎ Coalesced into {len(projections['coalesced'])} multi-subcalendar events")
+    return projections
+
+
+def check_overlaps(projections, catalog, mode="skip", known=()):
+    """
+    Report the events TeamUp would reject for overlapping in a no-overlap
+    subcalendar (checked against `known` existing events too) and, in
+    "skip" mode, take those subcalendars off them. mode "off" skips the check.
+    """
+    if mode == "off":
+        return projections
+    events = [ev for proj in projections.values() for ev in proj]
+    with METRICS.stage("overlap_check"):
+        conflicts = find_conflicts(events, no_overlap_subcalendars(catalog), existing=known)
+    report_conflicts(conflicts, catalog)
+    if conflicts and mode == "skip":
+        projections = {name: drop_conflicts(proj, conflicts) for name, proj in projections.items()}
+    return projections
+
+
+def sync_weeks(client, events, start_date, end_date, changed, apply_ops, store, journal,
+               hot_days=(0, 0), full=False, refresh=False):
+    """
+    Sync the weeks of the window that changed plus those overlapping the
+    hot window (today − hot_days[0] … today + hot_days[1]); every week with
+    full=True or while the state store is still empty. Returns the plan.
+    """
+    hot = hot_window(*hot_days)
+    partitions = week_partitions(start_date, end_date, hot)
+    # (a fresh state store knows nothing yet, so its first sync covers every week)
+    if store.seeded and not (full or refresh):
+        partitions = select_partitions(partitions, changed)
+    if hot:
+        print(f"▶︎ Hot window {hot[0]} → {hot[1]}: syncing {len(partitions)} week(s)")
+
+    with METRICS.stage("sync"):
+        return sync_partitions(client, events, partitions, apply_ops, store=store, refresh=refresh, journal=journal)
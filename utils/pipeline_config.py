@@ -0,0 +1,73 @@
+# ─── PIPELINE CONFIG ────────────────────────────────────────────────────────
+import os
+from datetime import date
+
+# The environment overrides are read by the functions below, on call, so
+# importing this module has no side effects. Entry points call load_env()
+# first, so values set in .env count too.
+_env_loaded = False
+
+
+def load_env():
+    """Load .env into os.environ (once), as client_from_env does."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv(override=True)
+        _env_loaded = True
+
+# ─── Smartabase report ──────────────────────────────────────────────────────
+def sb_report_url():
+    """The training plan report (SB_REPORT_URL overrides it, e.g. to point at the benchmark stand-in server)."""
+    return os.getenv("SB_REPORT_URL") or (
+        "https://aspire.smartabase.com/aspireacademy/live"
+        "?report=PYTHON6_TRAINING_PLAN&updategroup=true"
+    )
+
+# ─── Sync window ────────────────────────────────────────────────────────────
+def season():
+    """(start, end) of the season the pipeline manages (SYNC_START / SYNC_END = YYYY-mm-dd override it)."""
+    return (date.fromisoformat(os.getenv("SYNC_START") or "2025-05-11"),
+            date.fromisoformat(os.getenv("SYNC_END") or "2025-12-31"))
+
+
+def hot_window_days():
+    """
+    (past, future) days of the rolling "hot" window, today − past .. today +
+    future: always fully reconciled against TeamUp; weeks outside it are only
+    synced when their data changed.
+    """
+    return (int(os.getenv("HOT_WINDOW_PAST_DAYS") or 7),
+            int(os.getenv("HOT_WINDOW_FUTURE_DAYS") or 90))
+
+# ─── Daemon ─────────────────────────────────────────────────────────────────
+DAEMON_INTERVAL    = 300          # seconds between Smartabase polls
+DAEMON_HOT_EVERY   = 6 * 60 * 60  # full reconcile of the hot window
+DAEMON_CATALOG_TTL = 60 * 60      # re-read the subcalendar list
+
+# ─── Filters ────────────────────────────────────────────────────────────────
+VENUE_LIST = [
+    "Basement Track", "Blue Ice", "Fencing Hall", "Gym A", "Gym B", "Gym C",
+    "Indoor Track", "Khalifa Stadium", "MPH 1", "Outdoor Throws", "Outdoor Track",
+    "PadelIN", "Physiology Lab", "Sand Court", "Sport Psychology Suite Common Area",
+    "Squash Courts", "Swimming Pool", "Table Tennis Hall", "MPH 2",
+    "Aspire Park", "Federation", "FPC Pitch","_MISSING"
+]
+
+GROUPS_TO_REMOVE = ["Jumps_Linus", "Jumps_Pawel", "Decathlon_Willem","Endurance_Driss","Endurance_Kada","Endurance_Khamis","Sprints_Francis","Sprints_Yasmani","Sprints_Rafal","Throws_Keida","Throws_Krzysztof"]
+
+# ─── Subcalendar structure ──────────────────────────────────────────────────
+STRUCTURE_CSV = "Venue and Group Calendar Structure.csv"
+
+def preserved_subcalendars():
+    """
+    Subcalendars the structure reconciler / purge never touch, as names or ids.
+    Override with TEAMUP_PRESERVED_SUBCALENDARS="Name A,Name B,12345".
+    Default: the calendars the old delete script kept (incl. Barney's).
+    """
+    return [
+        item.strip()
+        for item in (os.getenv("TEAMUP_PRESERVED_SUBCALENDARS") or "14217582,15155825,15166082").split(",")
+        if item.strip()
+    ]
@@ -0,0 +1,178 @@
+# ─── PUSH ENGINE ────────────────────────────────────────────────────────────
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+DEFAULT_WORKERS  = 8
+DEFAULT_RATE     = 5.0    # requests / second to start at (the old 0.2 s sleep)
+DEFAULT_MAX_RATE = 20.0   # never probe above this
+MAX_ATTEMPTS     = 4      # per event, counting 429 retries only
+
+
+# ─── Rate limiting ──────────────────────────────────────────────────────────
+class TokenBucket:
+    """
+    Thread-safe token bucket whose rate adapts to the API:
+    halved (and paused for Retry-After) once per burst of 429s, and raised
+    again on success – in steps proportional to the rate, so it climbs back
+    to the API's quota in a few dozen calls.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, max_rate=DEFAULT_MAX_RATE, min_rate=0.5, increase=0.05):
+        self.rate       = float(rate)
+        self.max_rate   = float(max_rate)
+        self.min_rate   = float(min_rate)
+        self.increase   = float(increase)
+        self.capacity   = max(1.0, self.rate)
+        self.tokens     = self.capacity
+        self.updated    = time.monotonic()
+        self.throttles  = 0
+        self._lock      = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = max(0.0, now - self.updated)
+                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+                self.updated = max(now, self.updated)
+                if self.tokens >= 1 and now >= self.updated:
+                    self.tokens -= 1
+                    return
+                wait = max(self.updated - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def throttle(self, retry_after=None):
+        """
+        Back off after a 429: halve the rate and hold every worker for
+        retry_after seconds. 429s arriving while that pause is on belong to
+        the same burst (requests already in flight) and don't halve it again.
+        """
+        with self._lock:
+            if self.updated > time.monotonic():
+                return
+            self.throttles += 1
+            self.rate     = max(self.min_rate, self.rate / 2)
+            self.capacity = max(1.0, self.rate)
+            self.tokens   = 0.0
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            # no tokens accrue while paused
+            self.updated = max(self.updated, time.monotonic() + pause)
+
+    def reward(self):
+        """Increase after a successful call: `increase` of the rate (at least 0.1 req/s)."""
+        with self._lock:
+            self.rate     = min(self.max_rate, self.rate + max(0.1, self.rate * self.increase))
+            self.capacity = max(1.0, self.rate)
+
+
+def retry_after_seconds(resp):
+    """Parse a Retry-After header (seconds or HTTP date); None if absent/unparseable."""
+    if resp is None:
+        return None
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+# ─── Push ───────────────────────────────────────────────────────────────────
+def _created_id(body):
+    if isinstance(body, dict):
+        ev = body.get("event", body)
+        if isinstance(ev, dict):
+            return ev.get("id")
+    return None
+
+
+def push_events(events, push_fn, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, max_rate=DEFAULT_MAX_RATE,
+                max_attempts=MAX_ATTEMPTS, bucket=None):
+    """
+    Call push_fn(event) for every event on a bounded thread pool behind a TokenBucket
+    (pass `bucket` to keep one learned rate across several calls, e.g. batches).
+
+    Returns one result dict per event, in input order:
+      event, id (TeamUp id from the response), response (its JSON body),
+      status ("ok" | "failed"), http_status (on failure), attempts,
+      latency (seconds spent in push_fn, summed over the attempts),
+      queued (seconds waiting for the rate limiter / Retry-After), error
+    """
+    own_bucket = bucket is None
+    if own_bucket:
+        bucket = TokenBucket(rate=min(rate, max_rate), max_rate=max_rate)
+
+    def run(ev):
+        result = {"event": ev, "id": None, "response": None, "status": "failed", "http_status": None,
+                  "attempts": 0, "latency": 0.0, "queued": 0.0, "error": None}
+        for attempt in range(1, max_attempts + 1):
+            result["attempts"] = attempt
+            waited = time.monotonic()
+            bucket.acquire()
+            started = time.monotonic()
+            result["queued"] += started - waited
+            try:
+                body = push_fn(ev)
+            except requests.HTTPError as err:
+                result["latency"] += time.monotonic() - started
+                resp = err.response
+                result["http_status"] = resp.status_code if resp is not None else None
+                result["error"] = str(err)
+                if result["http_status"] == 429 and attempt < max_attempts:
+                    bucket.throttle(retry_after_seconds(resp))
+                    continue
+                break
+            except Exception as err:
+                result["latency"] += time.monotonic() - started
+                result["error"] = str(err)
+                break
+            result["latency"] += time.monotonic() - started
+            bucket.reward()
+            result.update(status="ok", id=_created_id(body), response=body, http_status=None, error=None)
+            break
+        return result
+
+    if not events:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(run, events))
+    if own_bucket:
+        print(f"▶︎ Push engine finished at {bucket.rate:.1f} req/s ({bucket.throttles} throttle(s))")
+    return results
+
+
+VERBS = {"create": "Created", "update": "Updated", "delete": "Deleted"}
+
+
+def report_results(results, verb="Created"):
+    """
+    Print the familiar [OK]/[FAIL] lines plus a one-line summary. Results of
+    journaled operations (with an "op") use that operation's verb.
+    """
+    if not results:
+        return 0
+    for r in results:
+        ev = r["event"]
+        if r["status"] == "ok":
+            print(f"[OK]   {VERBS.get(r.get('op'), verb)}: {ev.get('title')} @ {ev.get('start_dt')}")
+        else:
+            print(f"[FAIL] {ev.get('title')}  — {r['error']}")
+
+    ok = sum(r["status"] == "ok" for r in results)
+    latencies = sorted(r["latency"] for r in results)
+    queued    = sorted(r.get("queued", 0.0) for r in results)
+    print(f"▶︎ {ok}/{len(results)} events OK (median latency {latencies[len(latencies) // 2] * 1000:.0f} ms, "
+          f"queued {queued[len(queued) // 2] * 1000:.0f} ms)")
+    return ok
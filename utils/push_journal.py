@@ -0,0 +1,153 @@
+# ─── PUSH JOURNAL ───────────────────────────────────────────────────────────
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_JOURNAL_PATH     = os.path.join(".cache", "push_journal.json")
+DEFAULT_DEAD_LETTER_PATH = os.path.join(".cache", "dead_letter.ndjson")
+DEFAULT_BATCH_SIZE       = 50
+
+
+def ops_fingerprint(ops):
+    """Identity of a list of push operations, so a resume only continues the same run."""
+    h = hashlib.md5()
+    for op in ops:
+        h.update(json.dumps(op, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def batch_bounds(ops, start, batch_size):
+    """
+    (i, j) slices of ops[start:] of at most batch_size, never mixing deletes
+    with other operations: a batch runs its operations concurrently, so a
+    delete only has finished before a create when they're in different batches.
+    """
+    i = start
+    while i < len(ops):
+        j = min(i + batch_size, len(ops))
+        is_delete = ops[i].get("op") == "delete"
+        for k in range(i + 1, j):
+            if (ops[k].get("op") == "delete") != is_delete:
+                j = k
+                break
+        yield i, j
+        i = j
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+class PushJournal:
+    """
+    Runs a list of push operations ({"op": "create" | "update" | "delete",
+    "event": ..., "old": ...}) in batches, checkpointing after each batch so an
+    interrupted run resumes from the last committed position. Operations that
+    fail are appended, with their error, to a dead-letter NDJSON file that
+    redrive() replays later.
+    """
+
+    def __init__(self, path=DEFAULT_JOURNAL_PATH, dead_letter_path=DEFAULT_DEAD_LETTER_PATH,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        self.path             = path
+        self.dead_letter_path = dead_letter_path
+        self.batch_size       = max(1, batch_size)
+
+    # ─── Checkpoints ────────────────────────────────────────────────────────
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _checkpoint(self, run_id, committed, total):
+        _write_atomic(self.path, {
+            "run_id": run_id, "committed": committed, "total": total, "updated_at": time.time()
+        })
+
+    def run(self, ops, apply_fn):
+        """
+        apply_fn(batch) → one result dict per op (see push_engine.push_events).
+        Returns the results of the ops processed by this call.
+        """
+        run_id = ops_fingerprint(ops)
+        state = self._load()
+        start = state.get("committed", 0) if state.get("run_id") == run_id else 0
+        if start:
+            print(f"▶︎ Resuming push run {run_id[:8]} at {start}/{len(ops)}")
+
+        results = []
+        for i, j in batch_bounds(ops, start, self.batch_size):
+            batch_results = apply_fn(ops[i:j])
+            self.dead_letter([r for r in batch_results if r["status"] != "ok"])
+            self._checkpoint(run_id, j, len(ops))
+            results.extend(batch_results)
+
+        # finished – nothing to resume
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        return results
+
+    # ─── Dead letters ───────────────────────────────────────────────────────
+    def dead_letter(self, results):
+        if not results:
+            return
+        os.makedirs(os.path.dirname(self.dead_letter_path) or ".", exist_ok=True)
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps({
+                    "op":          r.get("op", "create"),
+                    "event":       r["event"],
+                    "old":         r.get("old"),
+                    "error":       r.get("error"),
+                    "http_status": r.get("http_status"),
+                    "failed_at":   time.time(),
+                }, ensure_ascii=False, default=str) + "\n")
+        print(f"▶︎ {len(results)} failed operation(s) written to {self.dead_letter_path}")
+
+    def dead_letters(self):
+        try:
+            with open(self.dead_letter_path, encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def clear_dead_letters(self):
+        """Drop the queue, e.g. when a fresh --sync diff supersedes it."""
+        letters = self.dead_letters()
+        if letters:
+            os.remove(self.dead_letter_path)
+            print(f"▶︎ Dropped {len(letters)} dead-lettered operation(s); the new diff supersedes them")
+
+    def redrive(self, apply_fn):
+        """Replay only the dead-lettered operations; whatever fails again stays queued."""
+        pending = f"{self.dead_letter_path}.redriving"
+        if os.path.exists(pending):
+            # an earlier re-drive died part way – put its letters back in the queue
+            with open(pending, encoding="utf-8") as src, open(self.dead_letter_path, "a", encoding="utf-8") as dst:
+                dst.write(src.read())
+            os.remove(pending)
+
+        letters = self.dead_letters()
+        if not letters:
+            print("▶︎ Dead-letter queue is empty")
+            return []
+        ops = [{k: letter[k] for k in ("op", "event", "old") if letter.get(k) is not None} for letter in letters]
+        print(f"▶︎ Re-driving {len(ops)} dead-lettered operation(s)")
+
+        os.replace(self.dead_letter_path, pending)
+        results = []
+        for i, j in batch_bounds(ops, 0, self.batch_size):
+            batch_results = apply_fn(ops[i:j])
+            self.dead_letter([r for r in batch_results if r["status"] != "ok"])
+            results.extend(batch_results)
+        os.remove(pending)
+        return results
@@ -0,0 +1,173 @@
+# ─── RETRIES & CIRCUIT BREAKER ──────────────────────────────────────────────
+import collections
+import random
+import threading
+import time
+
+import requests
+
+from utils.instrumentation import METRICS
+from utils.push_engine import retry_after_seconds
+
+RETRYABLE_STATUS = {500, 502, 503, 504}
+SAFE_STATUS      = {502, 503, 504}     # the upstream never processed it – safe even for a POST
+IDEMPOTENT       = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """The service kept failing for longer than the breaker is willing to wait."""
+
+
+# ─── Retry policy ───────────────────────────────────────────────────────────
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: attempt n waits a random
+    0 … min(cap, base · 2^(n−1)) seconds, or Retry-After when that is longer.
+
+    Retryable: timeouts, connection errors and 5xx for idempotent methods;
+    for a POST only what can't have created anything (connect timeouts,
+    502/503/504). 429 is retried for GETs only – pushes leave it to the
+    push engine's token bucket. Anything else is returned/raised at once.
+    """
+
+    def __init__(self, max_attempts=4, base=0.5, cap=20.0):
+        self.max_attempts = max_attempts
+        self.base         = base
+        self.cap          = cap
+
+    def retryable(self, method, resp=None, error=None):
+        idempotent = method.upper() in IDEMPOTENT
+        if error is not None:
+            if isinstance(error, CircuitOpenError):
+                return False
+            if isinstance(error, requests.ConnectTimeout):
+                return True
+            return idempotent and isinstance(
+                error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+            )
+        if resp.status_code == 429:
+            return method.upper() == "GET"
+        return resp.status_code in (RETRYABLE_STATUS if idempotent else SAFE_STATUS)
+
+    def delay(self, attempt, resp=None):
+        backoff = random.uniform(0, min(self.cap, self.base * 2 ** (attempt - 1)))
+        retry_after = retry_after_seconds(resp)
+        return max(backoff, min(retry_after, self.cap)) if retry_after is not None else backoff
+
+
+# ─── Circuit breaker ────────────────────────────────────────────────────────
+class CircuitBreaker:
+    """
+    Opens when at least failure_ratio of the last `window` calls (and at
+    least min_calls) failed with a 5xx, timeout or connection error. While
+    open every caller waits out the cooldown instead of sending; then a
+    single probe goes through – success closes the breaker, failure re-opens
+    it with a doubled cooldown. After give_up_after seconds without
+    recovering, calls raise CircuitOpenError instead of waiting (probes
+    still go through, so a long-running process recovers).
+    """
+
+    def __init__(self, service, window=20, failure_ratio=0.5, min_calls=10,
+                 cooldown=15.0, max_cooldown=120.0, give_up_after=600.0):
+        self.service       = service
+        self.failure_ratio = failure_ratio
+        self.min_calls     = min_calls
+        self.base_cooldown = cooldown
+        self.max_cooldown  = max_cooldown
+        self.give_up_after = give_up_after
+
+        self.state       = "closed"
+        self.outcomes    = collections.deque(maxlen=window)
+        self.cooldown    = cooldown
+        self.open_until  = 0.0
+        self.first_open  = None
+        self.probing     = False
+        self._lock       = threading.Lock()
+
+    def _open(self, now, reason):
+        self.state = "open"
+        self.open_until = now + self.cooldown
+        self.first_open = self.first_open or now
+        self.probing = False
+        METRICS.incr(self.service, "breaker_opened")
+        print(f"⚠ {self.service} circuit open for {self.cooldown:.0f}s ({reason})")
+
+    def before_call(self):
+        """Block while the breaker is open; raises CircuitOpenError once it gave up."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.state == "closed":
+                    break
+                if self.state == "open" and now >= self.open_until:
+                    self.state = "half_open"
+                if self.state == "half_open" and not self.probing:
+                    self.probing = True
+                    break
+                if now - self.first_open > self.give_up_after:
+                    raise CircuitOpenError(f"{self.service} unavailable for {self.give_up_after:.0f}s – giving up")
+                wait = max(0.05, self.open_until - now) if self.state == "open" else 0.25
+            time.sleep(wait)
+            waited += wait
+        if waited:
+            METRICS.incr(self.service, "breaker_wait_s", round(waited, 3))
+
+    def record(self, success):
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "half_open":
+                if success:
+                    self.state, self.cooldown, self.first_open = "closed", self.base_cooldown, None
+                    self.outcomes.clear()
+                    print(f"▶︎ {self.service} circuit closed again")
+                else:
+                    self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                    self._open(now, "probe failed")
+                return
+            if self.state != "closed":
+                return
+            self.outcomes.append(success)
+            failures = self.outcomes.count(False)
+            if len(self.outcomes) >= self.min_calls and failures >= self.failure_ratio * len(self.outcomes):
+                self._open(now, f"{failures}/{len(self.outcomes)} recent calls failed")
+
+
+# ─── Sending ────────────────────────────────────────────────────────────────
+def send_with_retries(send, method, service, route, policy=None, breaker=None):
+    """
+    Call send() → requests.Response until it succeeds, isn't retryable or
+    the attempts run out (the last response is returned / error raised).
+    Every attempt goes through the breaker; failed attempts without a
+    response are recorded as status "error" in METRICS.
+    """
+    policy = policy or RetryPolicy()
+    for attempt in range(1, policy.max_attempts + 1):
+        if breaker is not None:
+            breaker.before_call()
+        started = time.perf_counter()
+        try:
+            resp = send()
+        except requests.RequestException as err:
+            # no response, so the session hook never saw it
+            METRICS.record_request(service, route, "error", time.perf_counter() - started)
+            if breaker is not None:
+                breaker.record(False)
+            if attempt < policy.max_attempts and policy.retryable(method, error=err):
+                METRICS.incr(service, "retries")
+                time.sleep(policy.delay(attempt))
+                continue
+            if attempt > 1:
+                METRICS.incr(service, "gave_up")
+            raise
+
+        if breaker is not None:
+            breaker.record(resp.status_code < 500)
+        if attempt < policy.max_attempts and policy.retryable(method, resp=resp):
+            METRICS.incr(service, "retries")
+            resp.close()
+            time.sleep(policy.delay(attempt, resp))
+            continue
+        if attempt > 1 and policy.retryable(method, resp=resp):
+            METRICS.incr(service, "gave_up")
+        return resp
@@ -0,0 +1,80 @@
+# ─── SMARTABASE REPORT CACHE ────────────────────────────────────────────────
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "sb_report_cache.json")
+
+# the columns that end up in a TeamUp payload
+FINGERPRINT_COLUMNS = ["Date", "Training_Group", "Session_Type", "Venue", "Start_ISO", "End_ISO"]
+
+
+def partition_fingerprints(df, partition, columns=FINGERPRINT_COLUMNS):
+    """
+    {partition label → hash of that partition's rows}, independent of row order.
+    `partition` is a Series aligned with df (e.g. the Date column as strings).
+    """
+    cols = [c for c in columns if c in df]
+    if df.empty:
+        return {}
+    row_hash = pd.util.hash_pandas_object(df[cols].astype(str), index=False)
+    out = {}
+    for label, hashes in row_hash.groupby(partition.astype(str).values):
+        out[label] = hashlib.md5(np.sort(hashes.values).tobytes()).hexdigest()
+    return out
+
+
+class ReportCache:
+    """
+    What the last *successful* run saw: the report's ETag/Last-Modified (when
+    Smartabase sends them) and a fingerprint per date partition of the
+    cleaned table. Only saved once the TeamUp phase went through cleanly.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self.state = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            pass
+        self._pending = dict(self.state)
+
+    # ─── HTTP validators ────────────────────────────────────────────────────
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since for a repeat request of `url`."""
+        if self.state.get("url") != url:
+            return {}
+        headers = {}
+        if self.state.get("etag"):
+            headers["If-None-Match"] = self.state["etag"]
+        if self.state.get("last_modified"):
+            headers["If-Modified-Since"] = self.state["last_modified"]
+        return headers
+
+    def remember_response(self, url, response):
+        self._pending.update(
+            url=url,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    # ─── Content fingerprints ───────────────────────────────────────────────
+    def changed_partitions(self, fingerprints):
+        """Partitions that are new, different or gone since the last saved run."""
+        previous = self.state.get("partitions", {})
+        self._pending["partitions"] = fingerprints
+        labels = set(previous) | set(fingerprints)
+        return sorted(p for p in labels if previous.get(p) != fingerprints.get(p))
+
+    def save(self):
+        self._pending["updated_at"] = time.time()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self._pending, f, indent=1)
+        self.state = dict(self._pending)
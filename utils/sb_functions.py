@@ -1,6 +1,10 @@
 # ─── SMARTABASE FUNCTIONS ───────────────────────────────────────────────────
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from io import StringIO
+from lxml import etree
 
 # ─── SB Cleaning Functions ───────────────────────────────────────────────────
 def convert_to_time(timestamp_ms, offset_hours=12):
@@ -16,4 +20,165 @@ def convert_to_time(timestamp_ms, offset_hours=12):
             return local_dt.strftime('%H:%M')
     except Exception as e:
         print(f"Error converting timestamp {timestamp_ms!r}: {e}")
-    return None
\ No newline at end of file
+    return None
+
+# ─── Vectorised time conversion ──────────────────────────────────────────────
+MINUTE_MS = 60 * 1000
+DAY_MS    = 24 * 60 * MINUTE_MS
+
+
+def ms_to_minute_of_day(timestamp_ms, offset_hours=12):
+    """
+    Column version of convert_to_time: ms-since-epoch → milliseconds since local
+    midnight, truncated to the minute (NaN where the value isn't numeric).
+    """
+    ms = pd.to_numeric(timestamp_ms, errors="coerce").astype("float64")
+    local = np.mod(ms - offset_hours * 60 * MINUTE_MS, DAY_MS)
+    return np.floor(local / MINUTE_MS) * MINUTE_MS
+
+
+def add_iso_columns(df, date_col="Date", start_col="Start_Time", end_col="Finish_Time",
+                    offset_hours=12, tz_offset="+03:00"):
+    """
+    Add Start_ISO / End_ISO ("YYYY-mm-ddTHH:MM:SS+03:00") straight from the
+    Date column and the ms epoch time columns, without a per-row round trip
+    through HH:MM strings. Rows whose date or times can't be converted are
+    reported once, in bulk, and dropped.
+    """
+    day   = pd.to_datetime(df[date_col], errors="coerce")
+    start = ms_to_minute_of_day(df[start_col], offset_hours)
+    end   = ms_to_minute_of_day(df[end_col],   offset_hours)
+
+    bad = day.isna() | start.isna() | end.isna()
+    if bad.any():
+        sample = df.loc[bad, [date_col, start_col, end_col]].head(5).to_dict("records")
+        print(f"⚠ Dropping {int(bad.sum())} row(s) with unconvertible {date_col}/{start_col}/{end_col}, e.g. {sample}")
+
+    out  = df.loc[~bad].copy()
+    day  = day[~bad].dt.normalize()
+    fmt  = f"%Y-%m-%dT%H:%M:%S{tz_offset}"
+    out["Start_ISO"] = (day + pd.to_timedelta(start[~bad], unit="ms")).dt.strftime(fmt)
+    out["End_ISO"]   = (day + pd.to_timedelta(end[~bad],   unit="ms")).dt.strftime(fmt)
+    return out
+
+
+# ─── Report ingestion ────────────────────────────────────────────────────────
+DROP_COLUMNS = ['About', 'by', 'Academic Year', 'Day AM/PM', 'AM/PM', 'Day', 'Date Reverse']
+
+
+def normalize_column(name):
+    return name.strip().replace(' ', '_')
+
+
+@lru_cache(maxsize=4096)
+def parse_sb_date(value):
+    """Smartabase day-first date string → date (None if unparseable); dates repeat, so cached."""
+    try:
+        # the report's usual format; much cheaper than pd.to_datetime per value
+        return datetime.strptime(value, "%d/%m/%Y").date()
+    except (TypeError, ValueError):
+        pass
+    ts = pd.to_datetime(value, errors='coerce', dayfirst=True)
+    return None if pd.isna(ts) else ts.date()
+
+
+def iter_report_rows(source, header_out=None):
+    """
+    Yield the first HTML table of a report as {column: text or None} dicts,
+    parsing incrementally from a file-like object (e.g. response.raw) and
+    freeing each row once it has been yielded. The normalised column names
+    are appended to `header_out` (a list) as soon as the header row is read,
+    so callers know them even when the table has no data rows.
+    """
+    header = None
+    for _, el in etree.iterparse(source, events=("end",), tag=("tr", "table"), html=True):
+        if el.tag == "table":
+            if header is not None:
+                break
+            continue
+        cells = [" ".join("".join(c.itertext()).split()) or None for c in el if c.tag in ("td", "th")]
+        if header is None:
+            if cells and all(c.tag == "th" for c in el if c.tag in ("td", "th")):
+                header = [normalize_column(c or "") for c in cells]
+                if header_out is not None:
+                    header_out.extend(header)
+        elif cells:
+            yield dict(zip(header, cells))
+        # drop rows we've finished with so memory tracks the kept rows only
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+    if header is None:
+        raise ValueError("No HTML tables found in the response")
+
+
+def stream_training_plan(source, start_date, end_date, groups_to_remove=()):
+    """
+    Parse the training plan report row by row, keeping only rows inside the
+    date window that survive the group/sport/venue exclusions. Returns a frame
+    with normalised column names, Date as dates and the time columns numeric.
+    """
+    drop = {normalize_column(c) for c in DROP_COLUMNS}
+    exclude = set(groups_to_remove) | {"Practice"}
+    keep, header = [], []
+    for row in iter_report_rows(source, header):
+        tg    = str(row.get("Training_Group")).strip()
+        sport = row.get("Sport")
+        if tg in exclude or not sport or sport == "Generic_Athlete" or row.get("Venue") == "AASMC":
+            continue
+        day = parse_sb_date(row.get("Date"))
+        if day is None or not (start_date <= day <= end_date):
+            continue
+        row["Training_Group"] = tg
+        row["Date"] = day
+        keep.append({k: v for k, v in row.items() if k not in drop})
+
+    # (columns from the header row, so a report without data rows still has them)
+    columns = [k for k in dict.fromkeys(header) if k not in drop]
+    df = pd.DataFrame.from_records(keep, columns=columns)
+    for col in ("Start_Time", "Finish_Time"):
+        if col in df:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df.drop_duplicates()
+
+
+def read_training_plan(html):
+    """Whole-document fallback: first table of the report via pd.read_html."""
+    tables = pd.read_html(StringIO(html))
+    if not tables:
+        raise ValueError("No HTML tables found in the response")
+    return tables[0]
+
+
+def clean_training_plan(data, start_date, end_date, groups_to_remove=(), venue_list=()):
+    """Column clean-up and row filters shared by the streamed and read_html paths."""
+    df = (
+        data
+        .drop(columns=DROP_COLUMNS, errors='ignore')
+        .drop_duplicates()
+        .rename(columns=normalize_column)
+    )
+    # Strip spaces and standardize case just in case
+    df['Training_Group'] = df['Training_Group'].astype(str).str.strip()
+    df = df[~df['Training_Group'].isin(groups_to_remove)]
+
+    # Parse dates & restrict to the window
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce', dayfirst=True).dt.date
+    df = df[(df['Date'] >= start_date) & (df['Date'] <= end_date)]
+
+    # Filter out unwanted rows
+    df = df[
+        df['Sport'].notna()
+        & (df['Sport'].astype(str).str.strip() != '')
+        & (df['Venue'] != 'AASMC')
+        & (df['Sport'] != 'Generic_Athlete')
+        & (df['Training_Group'] != 'Practice')
+    ].copy()
+
+    # Fill NA text fields
+    df['Session_Type'] = df['Session_Type'].fillna('').astype(str)
+
+    # Venue clean-up
+    df['Venue'] = df['Venue'].fillna('_MISSING')
+    df['Venue'] = df['Venue'].where(df['Venue'].isin(venue_list), '_OTHER')
+    return df
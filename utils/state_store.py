@@ -0,0 +1,130 @@
+# ─── LOCAL EVENT STATE STORE ────────────────────────────────────────────────
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_STATE_DIR = ".cache"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    teamup_id       TEXT PRIMARY KEY,
+    key             TEXT NOT NULL,      -- event_key: subcalendar + start + end
+    version         TEXT,               -- make_version hash of the payload
+    teamup_version  TEXT,               -- TeamUp's own version, needed to update/delete
+    subcalendar_id  INTEGER,
+    subcalendar_ids TEXT,               -- JSON list
+    start_dt        TEXT NOT NULL,
+    end_dt          TEXT NOT NULL,
+    start_date      TEXT NOT NULL,      -- YYYY-mm-dd of start_dt, for window queries
+    title           TEXT,
+    location        TEXT,
+    all_day         INTEGER DEFAULT 0,
+    synced_at       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_key        ON events (key);
+CREATE INDEX IF NOT EXISTS events_start_date ON events (start_date);
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class EventStateStore:
+    """
+    SQLite record of every event we pushed: content key, make_version hash,
+    TeamUp id/version, subcalendar(s) and last sync time. Lets a run update
+    or delete known events directly instead of listing the calendar.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    @classmethod
+    def for_calendar(cls, calendar_key, state_dir=DEFAULT_STATE_DIR):
+        return cls(os.path.join(state_dir, f"teamup_state_{calendar_key}.sqlite"))
+
+    def close(self):
+        self.db.close()
+
+    # ─── Meta ───────────────────────────────────────────────────────────────
+    @property
+    def seeded(self):
+        """True once the store has been filled from a full TeamUp listing."""
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'seeded_at'").fetchone()
+        return row is not None
+
+    def _mark_seeded(self):
+        self.db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('seeded_at', ?)", (str(time.time()),))
+
+    # ─── Reads ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def _to_event(row):
+        return {
+            "id":              row["teamup_id"],
+            "subcalendar_id":  row["subcalendar_id"],
+            "subcalendar_ids": json.loads(row["subcalendar_ids"] or "[]"),
+            "start_dt":        row["start_dt"],
+            "end_dt":          row["end_dt"],
+            "title":           row["title"],
+            "location":        row["location"],
+            "all_day":         bool(row["all_day"]),
+            "version":         row["teamup_version"],
+        }
+
+    def events_between(self, start_date, end_date, subcalendar_ids=None):
+        """Known events starting in [start_date, end_date], shaped like TeamUp events."""
+        rows = self.db.execute(
+            "SELECT * FROM events WHERE start_date BETWEEN ? AND ? ORDER BY start_dt",
+            (str(start_date), str(end_date))
+        ).fetchall()
+        events = [self._to_event(r) for r in rows]
+        if subcalendar_ids is not None:
+            wanted = set(subcalendar_ids)
+            events = [ev for ev in events if set(ev["subcalendar_ids"]) & wanted]
+        return events
+
+    def by_key(self, key):
+        return [self._to_event(r) for r in self.db.execute("SELECT * FROM events WHERE key = ?", (key,))]
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    # ─── Writes ─────────────────────────────────────────────────────────────
+    def upsert(self, teamup_id, ev, key, teamup_version=None, synced_at=None):
+        subs = ev.get("subcalendar_ids") or ([ev["subcalendar_id"]] if ev.get("subcalendar_id") else [])
+        self.db.execute(
+            """INSERT OR REPLACE INTO events
+               (teamup_id, key, version, teamup_version, subcalendar_id, subcalendar_ids,
+                start_dt, end_dt, start_date, title, location, all_day, synced_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                str(teamup_id), key, ev.get("version"), teamup_version,
+                ev.get("subcalendar_id") or (subs[0] if subs else None), json.dumps(subs),
+                ev["start_dt"], ev["end_dt"], ev["start_dt"][:10],
+                ev.get("title"), ev.get("location"), int(bool(ev.get("all_day"))),
+                synced_at or time.time(),
+            )
+        )
+
+    def forget(self, teamup_ids):
+        self.db.executemany("DELETE FROM events WHERE teamup_id = ?", [(str(i),) for i in teamup_ids])
+
+    def replace_window(self, events, start_date, end_date, key_fn, subcalendar_ids=None):
+        """Reset the window from a full TeamUp listing (the events as TeamUp returned them)."""
+        stale = [ev["id"] for ev in self.events_between(start_date, end_date, subcalendar_ids)]
+        with self.db:
+            self.forget(stale)
+            now = time.time()
+            for ev in events:
+                key = key_fn(ev)
+                self.upsert(ev["id"], {**ev, "version": key}, key, teamup_version=ev.get("version"), synced_at=now)
+            self._mark_seeded()
+
+    def commit(self):
+        self.db.commit()
@@ -0,0 +1,110 @@
+# ─── SUBCALENDAR STRUCTURE FUNCTIONS ────────────────────────────────────────
+import csv
+
+from utils.subcalendar_catalog import SubcalendarCatalog, split_path
+from utils.teamup_functions import create_subcalendar, update_subcalendar, delete_subcalendar
+from utils.push_engine import push_events, DEFAULT_WORKERS, DEFAULT_RATE
+
+
+def load_structure(csv_path):
+    """The wanted subcalendars: [{name, color, overlap}] from the structure CSV."""
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        return [
+            {
+                "name":    " > ".join(split_path(row["Calendar Name"])),
+                "color":   int(row["Color Id"]),
+                "overlap": bool(int(row["Allow Overlap"])),  # 1 → True, 0 → False
+            }
+            for row in csv.DictReader(f)
+        ]
+
+
+def is_preserved(sc, preserved):
+    """preserved: names (any '>' spacing) or ids, as strings or ints."""
+    wanted = {str(p) for p in preserved} | {" > ".join(split_path(str(p))) for p in preserved}
+    return str(sc["id"]) in wanted or " > ".join(split_path(sc.get("name", ""))) in wanted
+
+
+def diff_structure(desired, live, preserved=()):
+    """
+    Compare the CSV structure with the live subcalendars by full name.
+
+    Returns {"create": [wanted], "patch": [(live, wanted)], "delete": [live],
+    "unchanged": n}. Preserved subcalendars are never patched or deleted.
+    """
+    by_name = {}
+    extras = []
+    for sc in live:
+        name = " > ".join(split_path(sc.get("name", "")))
+        if name in by_name:
+            extras.append(sc)       # a duplicate of a name we already matched
+        else:
+            by_name[name] = sc
+
+    create, patch, unchanged = [], [], 0
+    for want in desired:
+        sc = by_name.pop(want["name"], None)
+        if sc is None:
+            create.append(want)
+        elif is_preserved(sc, preserved):
+            unchanged += 1
+        elif sc.get("color") != want["color"] or bool(sc.get("overlap")) != want["overlap"]:
+            patch.append((sc, want))
+        else:
+            unchanged += 1
+
+    delete = [sc for sc in list(by_name.values()) + extras if not is_preserved(sc, preserved)]
+    return {"create": create, "patch": patch, "delete": delete, "unchanged": unchanged}
+
+
+def reconcile_structure(client, csv_path, preserved=(), prune=False, dry_run=False,
+                        workers=DEFAULT_WORKERS, rate=DEFAULT_RATE):
+    """
+    Create missing subcalendars, patch colour/overlap drift and, with prune,
+    delete subcalendars that are neither in the CSV nor preserved. Only the
+    differences are sent, through the bounded, rate-limited push engine.
+    Returns the diff plus a "failed" count.
+    """
+    desired = load_structure(csv_path)
+    catalog = SubcalendarCatalog.fetch(client, ttl=0)
+    diff = diff_structure(desired, list(catalog), preserved)
+
+    print(
+        f"▶︎ Structure: {len(diff['create'])} to create, {len(diff['patch'])} to patch, "
+        f"{len(diff['delete'])} extra{'' if prune else ' (kept, no --prune)'}, {diff['unchanged']} unchanged"
+    )
+    for want in diff["create"]:
+        print(f"  + {want['name']} (color={want['color']}, overlap={want['overlap']})")
+    for sc, want in diff["patch"]:
+        print(f"  ~ {want['name']} (color {sc.get('color')}→{want['color']}, overlap {sc.get('overlap')}→{want['overlap']})")
+    for sc in diff["delete"]:
+        print(f"  {'-' if prune else '?'} {sc.get('name')} [{sc['id']}]")
+
+    ops = [("create", want) for want in diff["create"]] + [("patch", pair) for pair in diff["patch"]]
+    if prune:
+        ops += [("delete", sc) for sc in diff["delete"]]
+    if dry_run or not ops:
+        diff["failed"] = 0
+        return diff
+
+    def apply(op):
+        kind, item = op
+        if kind == "create":
+            return create_subcalendar(client, {**item, "active": True, "type": 0})
+        if kind == "patch":
+            sc, want = item
+            return update_subcalendar(client, sc["id"], {"name": sc["name"], "active": sc.get("active", True),
+                                                         "color": want["color"], "overlap": want["overlap"]})
+        delete_subcalendar(client, item["id"])
+        return {"id": item["id"]}
+
+    results = push_events(ops, apply, workers=workers, rate=rate)
+    for r in results:
+        kind, item = r["event"]
+        name = item["name"] if kind != "patch" else item[1]["name"]
+        print(f"{'✓' if r['status'] == 'ok' else '✗'} {kind} “{name}”{'' if r['status'] == 'ok' else ' — ' + str(r['error'])}")
+
+    # the structure changed – don't let other scripts reuse a cached list
+    SubcalendarCatalog.invalidate(client)
+    diff["failed"] = sum(r["status"] != "ok" for r in results)
+    return diff
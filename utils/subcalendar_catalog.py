@@ -0,0 +1,99 @@
+# ─── SUBCALENDAR CATALOG ────────────────────────────────────────────────────
+import json
+import os
+import time
+
+DEFAULT_CACHE_DIR = ".cache"
+SEPARATOR = ">"
+
+
+def split_path(name):
+    """'Sport > AA > Fencing' → ['Sport', 'AA', 'Fencing']"""
+    return [part.strip() for part in name.split(SEPARATOR)]
+
+
+class SubcalendarCatalog:
+    """
+    The calendar's subcalendar list, fetched once and indexed by
+    full path, leaf name and top-level branch ("Sport", "Venue", ...).
+
+    Naming convention: "Sport > ... > Endurance_Driss", "Venue > Gym A".
+    """
+
+    def __init__(self, subcalendars, fetched_at=None):
+        self.subcalendars = list(subcalendars)
+        self.fetched_at   = fetched_at or time.time()
+
+        self.by_id     = {}
+        self.by_path   = {}
+        self.by_leaf   = {}   # leaf → [subcalendar, ...] across all branches
+        self.by_branch = {}   # branch → {leaf → [id, ...]}
+        for sc in self.subcalendars:
+            name  = sc.get("name", "")
+            parts = split_path(name)
+            self.by_id[sc["id"]] = sc
+            self.by_path[" > ".join(parts)] = sc
+            self.by_leaf.setdefault(parts[-1], []).append(sc)
+            if len(parts) > 1:
+                self.by_branch.setdefault(parts[0], {}).setdefault(parts[-1], []).append(sc["id"])
+
+    def __len__(self):
+        return len(self.subcalendars)
+
+    def __iter__(self):
+        return iter(self.subcalendars)
+
+    # ─── Lookups ────────────────────────────────────────────────────────────
+    def get(self, path):
+        """Subcalendar dict for a full name (spacing around '>' is ignored)."""
+        return self.by_path.get(" > ".join(split_path(path)))
+
+    def lookup(self, branch):
+        """{leaf name → [subcalendar ids]} for one branch, e.g. lookup("Venue")."""
+        return self.by_branch.get(branch, {})
+
+    def ids(self, branch, leaf):
+        return self.by_branch.get(branch, {}).get(leaf, [])
+
+    # ─── Fetch / cache ──────────────────────────────────────────────────────
+    @staticmethod
+    def cache_path(client, cache_dir=DEFAULT_CACHE_DIR):
+        return os.path.join(cache_dir, f"subcalendars_{client.calendar_key}.json")
+
+    @classmethod
+    def fetch(cls, client, ttl=None, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Download /subcalendars once. With a ttl (seconds; default from
+        TEAMUP_CATALOG_TTL, 0 = off) the list is cached on disk and reused
+        by any script run within that window.
+        """
+        if ttl is None:
+            ttl = float(os.getenv("TEAMUP_CATALOG_TTL", "0") or 0)
+        path = cls.cache_path(client, cache_dir)
+
+        if ttl > 0 and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    cached = json.load(f)
+                if time.time() - cached["fetched_at"] < ttl:
+                    return cls(cached["subcalendars"], cached["fetched_at"])
+            except (OSError, ValueError, KeyError):
+                pass
+
+        resp = client.get("subcalendars")
+        resp.raise_for_status()
+        catalog = cls(resp.json().get("subcalendars", []))
+
+        if ttl > 0:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": catalog.fetched_at, "subcalendars": catalog.subcalendars}, f)
+        return catalog
+
+    @classmethod
+    def invalidate(cls, client, cache_dir=DEFAULT_CACHE_DIR):
+        """Drop the on-disk copy, e.g. after subcalendars were created or deleted."""
+        try:
+            os.remove(cls.cache_path(client, cache_dir))
+        except FileNotFoundError:
+            pass
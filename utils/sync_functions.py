@@ -0,0 +1,248 @@
+# ─── SYNC FUNCTIONS ─────────────────────────────────────────────────────────
+import hashlib
+from datetime import date
+
+from utils.teamup_functions import (
+    normalize_iso,
+    primary_subcalendar,
+    event_key,
+    add_event_to_sub_calendar,
+    update_event,
+    delete_event
+)
+from utils.event_index import EventIndex
+from utils.push_engine import push_events, report_results, TokenBucket, DEFAULT_WORKERS, DEFAULT_RATE
+from utils.push_journal import batch_bounds
+
+DEFAULT_LIST_WORKERS = 4   # concurrent TeamUp listings, one per month
+
+
+# ─── Keys ───────────────────────────────────────────────────────────────────
+def event_content(ev) -> str:
+    """Hash of the fields we own but which don't change an event's identity."""
+    subs = sorted(ev.get("subcalendar_ids") or [primary_subcalendar(ev)])
+    s = f"{ev.get('title', '')}|{ev.get('location', '')}|{subs}|{bool(ev.get('all_day'))}"
+    return hashlib.md5(s.encode("utf-8")).hexdigest()
+
+
+# ─── Diff ───────────────────────────────────────────────────────────────────
+def diff_events(desired, existing=(), by_key=None):
+    """
+    Match desired payloads against existing TeamUp events by event_key.
+    by_key – the existing events already grouped by event_key (e.g.
+    EventIndex.by_key), used instead of grouping `existing`; not modified.
+
+    Returns a dict with:
+      creates – desired payloads with no existing counterpart
+      updates – (existing event, desired payload) pairs whose content differs
+      deletes – existing events with no desired counterpart
+      unchanged – count of events already up to date
+    (sync_events adds failed – how many of those operations didn't go through)
+    Several events may share a key (e.g. two session types at the same time),
+    so matching is done per key, exact content matches first.
+    """
+    if by_key is not None:
+        by_key = {key: list(evs) for key, evs in by_key.items()}
+    else:
+        by_key = {}
+        for ev in existing:
+            by_key.setdefault(event_key(ev), []).append(ev)
+
+    creates, updates, unchanged = [], [], 0
+    pending = {}
+    for ev in desired:
+        pending.setdefault(event_key(ev), []).append(ev)
+
+    for key, wanted in pending.items():
+        have = by_key.pop(key, [])
+        # 1) pair up identical content
+        leftover = []
+        for ev in wanted:
+            content = event_content(ev)
+            match = next((h for h in have if event_content(h) == content), None)
+            if match is not None:
+                have.remove(match)
+                unchanged += 1
+            else:
+                leftover.append(ev)
+        # 2) re-use remaining existing events for updates
+        for ev in leftover:
+            if have:
+                updates.append((have.pop(0), ev))
+            else:
+                creates.append(ev)
+        # 3) anything still left under this key is surplus
+        by_key.setdefault(key, []).extend(have)
+
+    deletes = [ev for evs in by_key.values() for ev in evs]
+    return {
+        "creates":   creates,
+        "updates":   updates,
+        "deletes":   deletes,
+        "unchanged": unchanged,
+    }
+
+
+# ─── State store ────────────────────────────────────────────────────────────
+def _normalized(ev):
+    return {**ev, "start_dt": normalize_iso(ev["start_dt"]), "end_dt": normalize_iso(ev["end_dt"])}
+
+
+def _teamup_version(result):
+    body = result.get("response")
+    ev = body.get("event", body) if isinstance(body, dict) else None
+    return ev.get("version") if isinstance(ev, dict) else None
+
+
+def record_results(store, results):
+    """
+    Write push results into the EventStateStore. Each result's "op" says what
+    was done (default "create"); "event" is the desired payload and "old" the
+    TeamUp event an update/delete replaced. Events TeamUp no longer knows
+    (404) are forgotten.
+    """
+    with store.db:
+        for r in results:
+            op = r.get("op", "create")
+            if op == "create":
+                if r["status"] == "ok" and r["id"] is not None:
+                    ev = _normalized(r["event"])
+                    store.upsert(r["id"], ev, event_key(ev), _teamup_version(r))
+            elif op == "update":
+                if r["status"] == "ok":
+                    ev = _normalized(r["event"])
+                    store.upsert(r["old"]["id"], ev, event_key(ev), _teamup_version(r))
+                elif r["http_status"] == 404:
+                    store.forget([r["old"]["id"]])
+            elif op == "delete" and (r["status"] == "ok" or r["http_status"] == 404):
+                store.forget([r["old"]["id"]])
+
+
+# ─── Operations ─────────────────────────────────────────────────────────────
+def plan_ops(plan):
+    """
+    Flatten a diff_events plan into journal operations, deletes first. The
+    journal runs the deletes in batches of their own (see batch_bounds), so
+    a replaced event has freed its slot in a no-overlap subcalendar before
+    the new one is created.
+    """
+    return (
+        [{"op": "delete", "event": old, "old": old} for old in plan["deletes"]]
+        + [{"op": "update", "event": ev, "old": old} for old, ev in plan["updates"]]
+        + [{"op": "create", "event": ev} for ev in plan["creates"]]
+    )
+
+
+def make_applier(client, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, store=None):
+    """
+    Return apply(ops) → results: pushes a batch of operations through the push
+    engine (one TokenBucket shared by every batch) and records them in `store`.
+    """
+    bucket = TokenBucket(rate=rate)
+
+    def push(op):
+        if op["op"] == "create":
+            return add_event_to_sub_calendar(client, op["event"])
+        if op["op"] == "update":
+            old = op["old"]
+            # TeamUp expects the server-side version of the event being replaced
+            return update_event(client, old["id"], {**op["event"], "version": old.get("version")})
+        delete_event(client, op["old"]["id"], op["old"].get("version"))
+        return {"id": op["old"]["id"]}
+
+    def apply(ops):
+        results = push_events(ops, push, workers=workers, bucket=bucket)
+        for r in results:
+            op = r["event"]
+            r.update(op=op["op"], event=op["event"], old=op.get("old"))
+        report_results(results)
+        if store is not None:
+            record_results(store, results)
+        return results
+
+    return apply
+
+
+# ─── Sync ───────────────────────────────────────────────────────────────────
+def sync_events(client, desired, start_date, end_date, apply_ops, store=None, refresh=False, journal=None):
+    """
+    Bring TeamUp in line with `desired` for the date window, touching only
+    events in the subcalendars the desired payloads use.
+
+    With an EventStateStore the existing events come from the store instead
+    of a TeamUp listing (the first run, or refresh=True, lists and seeds it).
+    The resulting operations go through apply_ops (see make_applier), via the
+    PushJournal when one is given.
+    """
+    window = {"label": str(start_date), "start": start_date, "end": end_date, "hot": False}
+    return sync_partitions(client, desired, [window], apply_ops, store=store, refresh=refresh, journal=journal)
+
+
+def sync_partitions(client, desired, partitions, apply_ops, store=None, refresh=False, journal=None,
+                    list_workers=DEFAULT_LIST_WORKERS):
+    """
+    sync_events for only some date partitions (see partition_functions):
+    desired events starting outside them are left alone, as are TeamUp events.
+
+    Hot partitions (and every partition on the first run or with refresh)
+    are re-listed from TeamUp in one bulk fetch (concurrent month slices,
+    see EventIndex); the others are diffed against the state store. All resulting operations share one
+    journal run, so the push engine works on every partition at once.
+    """
+    desired = [ev for ev in desired if primary_subcalendar(ev) is not None]
+    managed = sorted({sid for ev in desired for sid in ev.get("subcalendar_ids") or []})
+
+    wanted = {p["label"]: [] for p in partitions}
+    label_of = {}   # start day → partition label (None = not synced)
+    for ev in desired:
+        day = ev["start_dt"][:10]
+        if day not in label_of:
+            d = date.fromisoformat(day)
+            label_of[day] = next((p["label"] for p in partitions if p["start"] <= d <= p["end"]), None)
+        if label_of[day] is not None:
+            wanted[label_of[day]].append(ev)
+
+    seeded = store is not None and store.seeded
+    to_list = [p for p in partitions if refresh or p["hot"] or not seeded]
+    listed = {p["label"] for p in to_list}
+
+    # (the listed partitions are contiguous – all of them, or the hot window's –
+    #  so the index holds exactly their events and is diffed in one go)
+    index = None
+    if to_list:
+        index = EventIndex.load(client, min(p["start"] for p in to_list), max(p["end"] for p in to_list),
+                                managed, workers=list_workers)
+
+    plan = {"creates": [], "updates": [], "deletes": [], "unchanged": 0}
+
+    def merge(part):
+        for k in ("creates", "updates", "deletes"):
+            plan[k] += part[k]
+        plan["unchanged"] += part["unchanged"]
+
+    listed_wanted = []
+    for p in partitions:
+        if p["label"] in listed:
+            listed_wanted += wanted[p["label"]]
+            if store is not None:
+                existing = index.between(p["start"], p["end"], managed)
+                store.replace_window([_normalized(ev) for ev in existing], p["start"], p["end"], event_key, managed)
+        else:
+            merge(diff_events(wanted[p["label"]], store.events_between(p["start"], p["end"], managed)))
+    if index is not None:
+        merge(diff_events(listed_wanted, by_key=index.by_key))
+
+    print(
+        f"▶︎ Sync plan over {len(partitions)} partition(s) ({len(listed)} listed from TeamUp): "
+        f"{len(plan['creates'])} create, {len(plan['updates'])} update, "
+        f"{len(plan['deletes'])} delete, {plan['unchanged']} unchanged"
+    )
+
+    ops = plan_ops(plan)
+    if journal is not None:
+        results = journal.run(ops, apply_ops)
+    else:
+        # deletes finish before the updates / creates start (see plan_ops)
+        results = [r for i, j in batch_bounds(ops, 0, len(ops) or 1) for r in apply_ops(ops[i:j])]
+    plan["failed"] = sum(r["status"] != "ok" for r in results)
+    return plan
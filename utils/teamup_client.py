@@ -0,0 +1,155 @@
+# ─── TEAM UP CLIENT ─────────────────────────────────────────────────────────
+import os
+import threading
+import time
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.instrumentation import METRICS, route_of
+from utils.resilience import RetryPolicy, CircuitBreaker, send_with_retries
+
+DEFAULT_BASE_URL  = "https://api.teamup.com"
+DEFAULT_POOL_SIZE = 16
+DEFAULT_TIMEOUT   = (5, 30)        # (connect, read) seconds
+DEFAULT_TOKEN_TTL = 12 * 60 * 60   # used when TeamUp doesn't say when the token expires
+
+
+class TeamUpClient:
+    """
+    One pooled, keep-alive session for every TeamUp call.
+
+    The user bearer token is fetched from /auth/tokens on first use, cached,
+    and refreshed when it expires or when TeamUp answers 401. Calendar
+    requests are retried with backoff and share one circuit breaker.
+    """
+
+    def __init__(self, api_token, calendar_key, email, password, base_url=DEFAULT_BASE_URL,
+                 pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT, token_ttl=DEFAULT_TOKEN_TTL,
+                 app_name="Aspire Sports Department Calendar", device_id="sb_to_teamup",
+                 retry_policy=None, breaker=None):
+        self.api_token    = api_token
+        self.calendar_key = calendar_key
+        self.email        = email
+        self.password     = password
+        self.base_url     = base_url.rstrip("/")
+        self.timeout      = timeout
+        self.token_ttl    = token_ttl
+        self.app_name     = app_name
+        self.device_id    = device_id
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        METRICS.instrument_session(self.session, "teamup")
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker      = breaker or CircuitBreaker("teamup")
+
+        self._token      = None
+        self._expires_at = 0.0
+        self._lock       = threading.Lock()
+
+    # ─── Auth ───────────────────────────────────────────────────────────────
+    def _login(self):
+        url = f"{self.base_url}/auth/tokens"
+        resp = send_with_retries(
+            lambda: self.session.post(
+                url,
+                headers={
+                    "Teamup-Token": self.api_token,
+                    "Content-Type": "application/json",
+                    "Accept":       "application/json"
+                },
+                json={
+                    "app_name":  self.app_name,
+                    "device_id": self.device_id,
+                    "email":     self.email,
+                    "password":  self.password
+                },
+                timeout=self.timeout
+            ),
+            "POST", "teamup", route_of("POST", url), self.retry_policy, self.breaker
+        )
+        resp.raise_for_status()
+        body = resp.json()
+        self._token = body["auth_token"]
+
+        expires_at = body.get("expires_at")
+        try:
+            self._expires_at = datetime.fromisoformat(expires_at.replace("Z", "+00:00")).timestamp() - 60
+        except (AttributeError, ValueError):
+            self._expires_at = time.time() + self.token_ttl
+        print(f"▶︎ Authenticated, user token: {self._token[:20]}...")
+
+    @property
+    def user_token(self):
+        with self._lock:
+            if self._token is None or time.time() >= self._expires_at:
+                self._login()
+            return self._token
+
+    def invalidate_token(self, token=None):
+        """Forget the cached token (only if it is still `token`, when given)."""
+        with self._lock:
+            if token is None or token == self._token:
+                self._token = None
+
+    @property
+    def headers(self):
+        return {
+            "Teamup-Token":  self.api_token,
+            "Authorization": f"Bearer {self.user_token}",
+            "Content-Type":  "application/json",
+            "Accept":        "application/json"
+        }
+
+    # ─── Requests ───────────────────────────────────────────────────────────
+    def url(self, path):
+        return f"{self.base_url}/{self.calendar_key}/{path.lstrip('/')}"
+
+    def request(self, method, path, **kwargs):
+        """Send a calendar request (see utils/resilience.py); re-authenticates once on a 401."""
+        kwargs.setdefault("timeout", self.timeout)
+        url = self.url(path)
+        for attempt in range(2):
+            headers = self.headers
+            resp = send_with_retries(
+                lambda: self.session.request(method, url, headers=headers, **kwargs),
+                method, "teamup", route_of(method, url), self.retry_policy, self.breaker
+            )
+            if resp.status_code != 401 or attempt:
+                return resp
+            self.invalidate_token(headers["Authorization"].split(" ", 1)[1])
+        return resp
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def client_from_env(**kwargs):
+    """Build a TeamUpClient from the TEAMUP_* variables (.env is loaded first)."""
+    from dotenv import load_dotenv
+
+    load_dotenv(override=True)
+    return TeamUpClient(
+        api_token=os.getenv("TEAMUP_TOKEN"),
+        calendar_key=os.getenv("TEAMUP_CALENDAR_KEY"),
+        email=os.getenv("TEAMUP_EMAIL"),
+        password=os.getenv("TEAMUP_PASSWORD"),
+        base_url=os.getenv("TEAMUP_BASE_URL") or DEFAULT_BASE_URL,
+        **kwargs
+    )
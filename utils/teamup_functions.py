@@ -1,63 +1,26 @@
 # ─── Team Up FUNCTIONS ───────────────────────────────────────────────────
-from datetime import datetime
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 import hashlib
 
+from utils.subcalendar_catalog import SubcalendarCatalog
 
-def list_all_subcalendars(BASE_URL, CALENDAR_KEY, HEADERS):
-    url = f"{BASE_URL}/{CALENDAR_KEY}/subcalendars"
-    resp = requests.get(url, headers=HEADERS)
-    resp.raise_for_status()
 
-    subs = resp.json().get("subcalendars", [])
-    result = []
-    for sc in subs:
-        name = sc.get("name", "")
+def list_all_subcalendars(client, catalog=None):
+    catalog = catalog or SubcalendarCatalog.fetch(client)
+    return [{"id": sc["id"], "name": sc.get("name", "")} for sc in catalog]
 
-        result.append({
-            "id": sc["id"],
-            "name": name
-        })
-    return result
+def _branch_rows(catalog, branch, label):
+    # your naming convention: e.g. "Sport > Endurance_Driss", "Venue > Gym A"
+    leaf_by_id = {sid: leaf for leaf, ids in catalog.lookup(branch).items() for sid in ids}
+    return [{"id": sc["id"], label: leaf_by_id.get(sc["id"])} for sc in catalog]
 
-def list_training_group_subcalendars(BASE_URL, CALENDAR_KEY, HEADERS):
-    url = f"{BASE_URL}/{CALENDAR_KEY}/subcalendars"
-    resp = requests.get(url, headers=HEADERS)
-    resp.raise_for_status()
-    subs = resp.json().get("subcalendars", [])
-    result = []
-    for sc in subs:
-        name = sc.get("name", "")
-        # your naming convention: e.g. "Sport > Endurance_Driss"
-        if name.startswith("Sport >"):
-            tg = name.rsplit(">", 1)[1].strip()
-        else:
-            tg = None
-        result.append({
-            "id": sc["id"],
-            "Training Group": tg
-        })
-    return result
-
-
-def list_venue_subcalendars(BASE_URL, CALENDAR_KEY, HEADERS):
-    url = f"{BASE_URL}/{CALENDAR_KEY}/subcalendars"
-    resp = requests.get(url, headers=HEADERS)
-    resp.raise_for_status()
-    subs = resp.json().get("subcalendars", [])
-    result = []
-    for sc in subs:
-        name = sc.get("name", "")
-        # your naming convention: e.g. "Venue > Gym A"
-        if name.startswith("Venue >"):
-            tg = name.rsplit(">", 1)[1].strip()
-        else:
-            tg = None
-        result.append({
-            "id": sc["id"],
-            "Venue": tg
-        })
-    return result
+def list_training_group_subcalendars(client, catalog=None):
+    return _branch_rows(catalog or SubcalendarCatalog.fetch(client), "Sport", "Training Group")
+
+
+def list_venue_subcalendars(client, catalog=None):
+    return _branch_rows(catalog or SubcalendarCatalog.fetch(client), "Venue", "Venue")
 
 
 def parse_iso(date_str: str, time_str: str) -> str:
@@ -71,10 +34,39 @@ def make_version(subcal_id, start_iso, end_iso) -> str:
     s = f"{subcal_id}|{start_iso}|{end_iso}"
     return hashlib.md5(s.encode("utf-8")).hexdigest()
 
+def make_versions(subcal_ids, starts, ends):
+    """make_version over whole columns."""
+    return [make_version(sid, start, end) for sid, start, end in zip(subcal_ids, starts, ends)]
+
+def normalize_iso(ts: str, tz_offset: str = "+03:00") -> str:
+    """Re-format a TeamUp timestamp the same way parse_iso does, so keys compare equal."""
+    dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if dt.tzinfo is not None:
+        hours, minutes = tz_offset.split(":")
+        sign = -1 if hours.startswith("-") else 1
+        offset = timedelta(hours=int(hours), minutes=sign * int(minutes))
+        dt = dt.astimezone(timezone(offset))
+    return dt.strftime(f"%Y-%m-%dT%H:%M:%S{tz_offset}")
 
-def add_event_to_sub_calendar(base_url, calendar_key, headers, payload):
-    url = f"{base_url}/{calendar_key}/events"
-    resp = requests.post(url, json=payload, headers=headers)
+
+# ─── Event keys ─────────────────────────────────────────────────────────────
+def primary_subcalendar(ev):
+    """First subcalendar of an event, for both built payloads and TeamUp events."""
+    subs = ev.get("subcalendar_ids") or []
+    return ev.get("subcalendar_id") or (subs[0] if subs else None)
+
+
+def event_key(ev) -> str:
+    """Stable identity of an event: its subcalendar + start + end (see make_version)."""
+    return make_version(
+        primary_subcalendar(ev),
+        normalize_iso(ev["start_dt"]),
+        normalize_iso(ev["end_dt"]),
+    )
+
+
+def add_event_to_sub_calendar(client, payload):
+    resp = client.post("events", json=payload)
 
     if not resp.ok:
         print(f"[ERROR {resp.status_code}] {payload.get('title')} @ {payload.get('start_dt')}")
@@ -83,11 +75,93 @@ def add_event_to_sub_calendar(base_url, calendar_key, headers, payload):
 
     return resp.json()
 
-def delete_subcalendar(BASE_URL, CALENDAR_KEY, HEADERS, sub_id):
-    url = f"{BASE_URL}/{CALENDAR_KEY}/subcalendars/{sub_id}"
-    resp = requests.delete(url, headers=HEADERS)
+def list_events(client, start_date, end_date, subcalendar_ids=None):
+    """Return the raw TeamUp events between start_date and end_date (inclusive)."""
+    params = {
+        "startDate": str(start_date),
+        "endDate":   str(end_date),
+    }
+    if subcalendar_ids:
+        params["subcalendarId[]"] = list(subcalendar_ids)
+    resp = client.get("events", params=params)
+    resp.raise_for_status()
+    return resp.json().get("events", [])
+
+
+def month_slices(start_date, end_date):
+    """[(first, last)] calendar-month windows covering start_date..end_date."""
+    start = date.fromisoformat(str(start_date)[:10])
+    end   = date.fromisoformat(str(end_date)[:10])
+    out = []
+    while start <= end:
+        next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        out.append((start, min(end, next_month - timedelta(days=1))))
+        start = next_month
+    return out
+
+
+def fetch_events(client, start_date, end_date, subcalendar_ids=None, workers=8):
+    """
+    Every TeamUp event between start_date and end_date, fetched as
+    concurrent slices – one list_events per month – instead of one long
+    crawl. Events that several slices return (spanning a month end) come
+    back once.
+    """
+    slices = [(lo, hi, subcalendar_ids) for lo, hi in month_slices(start_date, end_date)]
+    if not slices:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(slices)))) as pool:
+        pages = pool.map(lambda s: list_events(client, *s), slices)
+        events = {}
+        for page in pages:
+            for ev in page:
+                events.setdefault(ev["id"], ev)
+    return list(events.values())
+
+
+def update_event(client, event_id, payload):
+    resp = client.put(f"events/{event_id}", json={**payload, "id": event_id})
+
+    if not resp.ok:
+        print(f"[ERROR {resp.status_code}] {payload.get('title')} @ {payload.get('start_dt')}")
+        print("→", resp.text)
+        resp.raise_for_status()
+
+    return resp.json()
+
+
+def delete_event(client, event_id, version=None):
+    params = {"version": version} if version else None
+    resp = client.delete(f"events/{event_id}", params=params)
+
+    if not resp.ok:
+        print(f"[ERROR {resp.status_code}] delete event {event_id}")
+        print("→", resp.text)
+        resp.raise_for_status()
+
+
+def create_subcalendar(client, payload):
+    resp = client.post("subcalendars", json=payload)
+    if not resp.ok:
+        print(f"✗ Failed “{payload.get('name')}”: {resp.status_code} {resp.text}")
+        resp.raise_for_status()
+    return resp.json()
+
+
+def update_subcalendar(client, sub_id, payload):
+    resp = client.put(f"subcalendars/{sub_id}", json=payload)
+    if not resp.ok:
+        print(f"✗ Failed to update {sub_id}: {resp.status_code} {resp.text}")
+        resp.raise_for_status()
+    return resp.json()
+
+
+def delete_subcalendar(client, sub_id):
+    resp = client.delete(f"subcalendars/{sub_id}")
     # Teamup returns 204 No Content on success
     if resp.status_code == 204:
         print(f"✅ Deleted sub-calendar {sub_id}")
     else:
         print(f"❌ Failed to delete {sub_id}: {resp.status_code} {resp.text}")
+        resp.raise_for_status()